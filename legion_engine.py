@@ -0,0 +1,554 @@
+import argparse
+import random
+import time
+from collections import Counter
+
+import numpy as np
+
+# Display-free Conquest engine. legion.py plays it at the terminal; simulations
+# drive it directly. A Campaign owns the whole game state and both random
+# sources (seeded together), and every decision goes through a policy object:
+#
+#   attack_orders(campaign, side)       yields (from, to, k, use_war_cry)
+#   diplomacy_answer(campaign, question) returns 0 or 1
+#
+# Nothing here prints or prompts; messages go to campaign.report if one is set.
+#
+#   python legion_engine.py --campaigns 1000 --seed 0 --ai planner
+
+UNIT_TYPES = ("swordsman", "spearman", "archer")
+BEATS = {"swordsman": "spearman", "spearman": "archer", "archer": "swordsman"}
+SIDE_LABELS = {"player": "Player", "ai": "AI"}
+MAX_ROUNDS = 1000
+
+# Diplomacy questions; the right answers are drawn per campaign
+QUESTIONS = [
+    {"question": "Which god is the patron of this city?", "answers": ["Athena", "Apollo"]},
+    {"question": "What is the main export of this region?", "answers": ["Olives", "Pottery"]},
+    {"question": "Who founded this city according to legend?", "answers": ["Cadmus", "Theseus"]},
+    {"question": "Which festival is most celebrated here?", "answers": ["Panathenaea", "Dionysia"]},
+    {"question": "What is the city's famous landmark?", "answers": ["Temple", "Theater"]}
+]
+
+# Default Conquest map
+CONQUEST_ADJACENCIES = {
+    "Sparta": ["Corinth", "Olympia"],
+    "Athens": ["Thebes", "Corinth"],
+    "Thebes": ["Athens", "Delphi", "Larissa"],
+    "Corinth": ["Sparta", "Athens", "Olympia"],
+    "Olympia": ["Sparta", "Corinth", "Delphi", "Pylos"],
+    "Delphi": ["Thebes", "Olympia", "Larissa"],
+    "Pylos": ["Olympia"],
+    "Larissa": ["Thebes", "Delphi"]
+}
+CONQUEST_START = {
+    "Sparta": ("player", {"swordsman": 5, "spearman": 5, "archer": 0}),
+    "Corinth": ("player", {"swordsman": 3, "spearman": 3, "archer": 3}),
+    "Olympia": ("player", {"swordsman": 4, "spearman": 2, "archer": 1}),
+    "Athens": ("ai", {"swordsman": 0, "spearman": 5, "archer": 5}),
+    "Thebes": ("ai", {"swordsman": 2, "spearman": 4, "archer": 3}),
+    "Delphi": ("ai", {"swordsman": 1, "spearman": 3, "archer": 4}),
+}
+CONQUEST_NEUTRALS = ["Pylos", "Larissa"]
+
+# Player class for Conquest and Custom modes
+class Player:
+    def __init__(self, name):
+        self.name = name
+        self.conquered = 0
+        self.war_cry_cooldown = -1  # -1 means not unlocked, 0 means available
+
+# Territory class for Conquest
+class Territory:
+    def __init__(self, name, is_neutral=False):
+        self.name = name
+        self.units = {"swordsman": 0, "spearman": 0, "archer": 0}
+        self.owner = None
+        self.adjacent = []
+        self.is_neutral = is_neutral
+
+# Helper function to format units for unit display
+def format_units(units):
+    return ", ".join([f"{count} {unit}{'s' if count > 1 else ''}" for unit, count in units.items() if count > 0]) or "0 units"
+
+# Helper function to pick k random units: a multivariate hypergeometric draw
+# over the unit types, each unit equally likely
+def sample_units(units, k, unit_rng):
+    drawn = unit_rng.multivariate_hypergeometric([units[unit] for unit in UNIT_TYPES], k)
+    return {unit: int(n) for unit, n in zip(UNIT_TYPES, drawn)}
+
+# Helper function to remove random units
+def remove_random_units(units, count, unit_rng):
+    count = min(count, sum(units.values()))
+    if count <= 0:
+        return 0
+    for unit, n in sample_units(units, count, unit_rng).items():
+        units[unit] -= n
+    return count
+
+# Helper function to clear all units
+def clear_units(units_dict):
+    for key in units_dict:
+        units_dict[key] = 0
+
+# Helper function to distribute units proportionally
+def distribute_units(original_units, total, unit_rng):
+    if total <= 0:
+        return {"swordsman": 0, "spearman": 0, "archer": 0}
+    original_total = sum(original_units.values())
+    if original_total == 0:
+        return {"swordsman": total, "spearman": 0, "archer": 0}
+    new_units = {"swordsman": 0, "spearman": 0, "archer": 0}
+    for unit, count in original_units.items():
+        new_units[unit] = round(count * total / original_total)
+    current_total = sum(new_units.values())
+    if current_total > total:
+        remove_random_units(new_units, current_total - total, unit_rng)
+    elif current_total < total:
+        available = [unit for unit in new_units if original_units[unit] > 0]
+        if available:
+            new_units[available[unit_rng.integers(len(available))]] += total - current_total
+    return new_units
+
+# Battle rule for Conquest and Custom modes. Takes both sides' units and
+# returns their units afterwards plus whether the attacker took the territory;
+# the caller applies the result. On a loss or a tie the attacker keeps only
+# the k units it committed.
+def resolve_battle(attacker_units, defender_units, k, use_war_cry, unit_rng):
+    committed_units = sample_units(attacker_units, k, unit_rng)
+    remaining_units = {unit: attacker_units[unit] - committed_units[unit] for unit in UNIT_TYPES}
+
+    attack_base = k
+    defense_base = sum(defender_units.values())
+
+    committed_types = [unit for unit in committed_units if committed_units[unit] > 0]
+    defender_types = [unit for unit in defender_units if defender_units[unit] > 0]
+    attacker_advantage = sum(1 for attacker_type in committed_types if BEATS[attacker_type] in defender_types)
+    defender_advantage = sum(1 for defender_type in defender_types if BEATS[defender_type] in committed_types)
+
+    A = attack_base + attacker_advantage + (1 if use_war_cry else 0)
+    D = defense_base + defender_advantage
+
+    if A > D:
+        remaining = max(1, A - D)
+        if sum(committed_units.values()) > 0:
+            survivors = dict(committed_units)
+            total_remaining = sum(survivors.values())
+            if total_remaining > remaining:
+                remove_random_units(survivors, total_remaining - remaining, unit_rng)
+        else:
+            survivors = {"swordsman": 1, "spearman": 0, "archer": 0}
+        return remaining_units, survivors, True
+    if A < D:
+        return committed_units, distribute_units(defender_units, max(1, D - A), unit_rng), False
+    if use_war_cry:
+        return committed_units, {"swordsman": 1, "spearman": 0, "archer": 0}, True
+    return committed_units, distribute_units(defender_units, 1, unit_rng), False
+
+# Helper function to raise a fresh garrison of 1-5 of each unit
+def random_units(rng):
+    return {
+        "swordsman": rng.randint(1, 5),
+        "spearman": rng.randint(1, 5),
+        "archer": rng.randint(1, 5)
+    }
+
+# Insertion-ordered set with O(1) add, discard and random choice. Iteration
+# order only depends on the sequence of changes, so seeded runs replay exactly.
+class IndexedSet:
+    def __init__(self, items=()):
+        self.items = list(dict.fromkeys(items))
+        self.index = {item: i for i, item in enumerate(self.items)}
+
+    def add(self, item):
+        if item not in self.index:
+            self.index[item] = len(self.items)
+            self.items.append(item)
+
+    def discard(self, item):
+        i = self.index.pop(item, None)
+        if i is None:
+            return
+        last = self.items.pop()
+        if i < len(self.items):
+            self.items[i] = last
+            self.index[last] = i
+
+    def choice(self, rng):
+        return rng.choice(self.items)
+
+    def __contains__(self, item):
+        return item in self.index
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+# Default policy: the original AI, a random subset of the possible attacks
+# with a random number of units committed to each
+class RandomPolicy:
+    interactive = False
+
+    def attack_orders(self, campaign, side):
+        rng = campaign.rng
+        possible_attacks = campaign.possible_attacks(side)
+        num_attacks = rng.randint(0, len(possible_attacks))
+        for attack_from, target in rng.sample(possible_attacks, num_attacks):
+            # Earlier battles this turn may have thinned or flipped either end
+            total_units = sum(attack_from.units.values())
+            if total_units < 2 or target.owner == attack_from.owner:
+                continue
+            yield attack_from, target, rng.randint(1, total_units - 1), False
+
+    def diplomacy_answer(self, campaign, question):
+        return campaign.rng.choice([0, 1])
+
+class Campaign:
+    def __init__(self, seed=None, player_policy=None, ai_policy=None):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.unit_rng = np.random.default_rng(seed)
+        self.player = Player("player")
+        self.ai = Player("AI")
+        self.neutral = Player("neutral")
+        self.europeans = Player("europeans")
+        self.sides = {"player": self.player, "ai": self.ai}
+        self.policies = {"player": player_policy or RandomPolicy(), "ai": ai_policy or RandomPolicy()}
+        self.territories = {}
+        # Indexes kept up to date by set_owner and set_units, so move generation
+        # and win checks never rescan the map:
+        #   owned[owner]                  territories held
+        #   unit_totals[owner]            units across them
+        #   frontier[(owner, enemy)]      edges (from, to) out of owner's land into enemy's
+        #   incoming[territory]           territories that list it as adjacent
+        self.owned = {}
+        self.unit_totals = {}
+        self.frontier = {}
+        self.incoming = {}
+        self.answers = [self.rng.choice([0, 1]) for _ in QUESTIONS]
+        self.rounds = 0
+        self.winner = None  # "player", "ai" or "europeans" once the campaign is over
+        self.report = None  # Called with each message when set, e.g. print
+
+    def say(self, message):
+        if self.report:
+            self.report(message)
+
+    def state_text(self):
+        return "\n".join([f"{t.name}: {format_units(t.units)}, owned by {t.owner.name}" for t in self.territories.values()])
+
+    def show_state(self):
+        if self.report:
+            self.report(self.state_text())
+
+    # Map setup
+    def link(self, adjacencies):
+        for name, adj_names in adjacencies.items():
+            self.territories[name].adjacent = [self.territories[adj_name] for adj_name in adj_names]
+        self.build_indexes()
+
+    # Build the indexes from scratch. A saved game passes the owned and
+    # frontier orders it had, so seeded picks carry on exactly as before.
+    def build_indexes(self, owned=None, frontier=None, unit_totals=None, incoming=None):
+        everyone = (self.player, self.ai, self.neutral, self.europeans)
+        territories = self.territories.values()
+        if unit_totals is None:
+            unit_totals = {owner: 0 for owner in everyone}
+            for territory in territories:
+                unit_totals[territory.owner] += sum(territory.units.values())
+        self.unit_totals = unit_totals
+        if incoming is None:
+            incoming = {territory: [] for territory in territories}
+            for territory in territories:
+                for adj in territory.adjacent:
+                    incoming[adj].append(territory)
+        self.incoming = incoming
+        if owned is None:
+            owned = {owner: [] for owner in everyone}
+            for territory in territories:
+                owned[territory.owner].append(territory)
+        if frontier is None:
+            frontier = {}
+            for territory in territories:
+                for adj in territory.adjacent:
+                    if adj.owner != territory.owner:
+                        frontier.setdefault((territory.owner, adj.owner), []).append((territory, adj))
+        self.owned = {owner: IndexedSet(owned.get(owner, ())) for owner in everyone}
+        self.frontier = {(owner, enemy): IndexedSet(frontier.get((owner, enemy), ()))
+                         for owner in everyone for enemy in everyone if owner != enemy}
+
+    def setup_conquest(self):
+        self.territories = {name: Territory(name, is_neutral=(name in CONQUEST_NEUTRALS)) for name in
+                            ["Sparta", "Athens", "Thebes", "Corinth", "Olympia", "Delphi", "Pylos", "Larissa"]}
+        for name, (side, units) in CONQUEST_START.items():
+            self.territories[name].owner = self.sides[side]
+            self.territories[name].units = dict(units)
+        for name in CONQUEST_NEUTRALS:
+            self.territories[name].owner = self.neutral
+            self.territories[name].units = random_units(self.rng)
+        self.link(CONQUEST_ADJACENCIES)
+
+    def setup_custom(self, territory_names, adjacencies):
+        self.territories = {name: Territory(name, is_neutral=False) for name in territory_names}
+        num_territories = len(territory_names)
+        if num_territories >= 7:
+            third = num_territories // 3
+            remainder = num_territories % 3
+            player_count = third + (1 if remainder > 0 else 0)
+            ai_count = third + (1 if remainder > 1 else 0)
+        else:
+            player_count = (num_territories + 1) // 2
+            ai_count = num_territories // 2
+        shuffled = list(territory_names)
+        self.rng.shuffle(shuffled)
+        for name in shuffled[:player_count]:
+            self.territories[name].owner = self.player
+            self.territories[name].units = {"swordsman": 5, "spearman": 5, "archer": 0}
+        for name in shuffled[player_count:player_count + ai_count]:
+            self.territories[name].owner = self.ai
+            self.territories[name].units = {"swordsman": 0, "spearman": 5, "archer": 5}
+        for name in shuffled[player_count + ai_count:]:
+            self.territories[name].owner = self.neutral
+            self.territories[name].is_neutral = True
+            self.territories[name].units = random_units(self.rng)
+        self.link(adjacencies)
+
+    # Ownership and unit changes; everything that moves a territory or its
+    # units goes through these two so the indexes stay in step
+    def set_owner(self, territory, owner):
+        old_owner = territory.owner
+        territory.is_neutral = False
+        if old_owner == owner:
+            return
+        for adj in territory.adjacent:
+            if adj.owner != old_owner:
+                self.frontier[(old_owner, adj.owner)].discard((territory, adj))
+        for source in self.incoming[territory]:
+            if source.owner != old_owner:
+                self.frontier[(source.owner, old_owner)].discard((source, territory))
+        total = sum(territory.units.values())
+        self.owned[old_owner].discard(territory)
+        self.unit_totals[old_owner] -= total
+        territory.owner = owner
+        self.owned[owner].add(territory)
+        self.unit_totals[owner] += total
+        for adj in territory.adjacent:
+            if adj.owner != owner:
+                self.frontier[(owner, adj.owner)].add((territory, adj))
+        for source in self.incoming[territory]:
+            if source.owner != owner:
+                self.frontier[(source.owner, owner)].add((source, territory))
+
+    def set_units(self, territory, units):
+        self.unit_totals[territory.owner] += sum(units.values()) - sum(territory.units.values())
+        territory.units = units
+
+    def conquer(self, territory, owner):
+        self.set_owner(territory, owner)
+        owner.conquered += 1
+        if owner.conquered >= 3 and owner.war_cry_cooldown == -1:
+            owner.war_cry_cooldown = 0
+
+    # Battle resolution; returns False if k is more than the attacker can commit
+    def battle(self, attacker_territory, defender_territory, k, use_war_cry=False):
+        if k > sum(attacker_territory.units.values()) - 1:
+            return False
+        attacker_units, defender_units, captured = resolve_battle(
+            attacker_territory.units, defender_territory.units, k, use_war_cry, self.unit_rng)
+        self.set_units(attacker_territory, attacker_units)
+        self.set_units(defender_territory, defender_units)
+        if captured:
+            self.conquer(defender_territory, attacker_territory.owner)
+        return True
+
+    # Run a battle and report the result under the attacker's label
+    def resolve_attack(self, label, attack_from, target, k, use_war_cry):
+        if self.battle(attack_from, target, k, use_war_cry):
+            if target.owner == attack_from.owner:
+                self.say(f"{attack_from.name} ({label}) Wins! {format_units(target.units)} remaining on {target.name}.")
+            else:
+                self.say(f"Attack from {attack_from.name} failed. {format_units(target.units)} on {target.name}.")
+            self.show_state()
+
+    # Frontier edges from owner into any of enemies, where the source can attack
+    def attacks_between(self, owner, enemies):
+        return [(t, adj) for enemy in enemies for t, adj in self.frontier[(owner, enemy)] if sum(t.units.values()) > 1]
+
+    # Attacks open to a side: the player may hit anything it doesn't own,
+    # the AI only goes after the player
+    def possible_attacks(self, side):
+        if side == "player":
+            return self.attacks_between(self.player, (self.ai, self.neutral, self.europeans))
+        return self.attacks_between(self.ai, (self.player,))
+
+    def owns_all(self, side):
+        return len(self.owned[self.sides[side]]) + len(self.owned[self.neutral]) == len(self.territories)
+
+    # One side's turn: play the policy's orders until it stops or the side wins
+    def side_turn(self, side):
+        owner = self.sides[side]
+        label = SIDE_LABELS[side]
+        policy = self.policies[side]
+        self.say(f"{label}'s turn")
+        if policy.interactive:
+            self.show_state()
+        elif not self.possible_attacks(side):
+            self.say(f"{label} has no valid attacks this turn.")
+        for attack_from, target, k, use_war_cry in policy.attack_orders(self, side):
+            use_war_cry = use_war_cry and owner.war_cry_cooldown == 0
+            if not policy.interactive:
+                self.say(f"{label} attacks from {attack_from.name} to {target.name} with {k} units")
+            self.resolve_attack(label, attack_from, target, k, use_war_cry)
+            if use_war_cry:
+                owner.war_cry_cooldown = 2
+            if owner.war_cry_cooldown > 0:
+                owner.war_cry_cooldown -= 1
+            if side == "player" and self.owns_all(side):
+                break
+
+    def player_turn(self):
+        self.side_turn("player")
+        if self.owns_all("player"):
+            self.say("Player wins!")
+            self.winner = "player"
+
+    def ai_turn(self):
+        self.side_turn("ai")
+        self.naval_assault()
+        if self.owns_all("ai"):
+            self.say("AI wins!")
+            self.winner = "ai"
+
+    # Diplomacy meeting: a neutral territory joins whoever the answer favours
+    def diplomacy_meeting(self):
+        rng = self.rng
+        if rng.random() < 1/3:
+            neutral_territories = self.owned[self.neutral]
+            if not neutral_territories:
+                return
+            target_territory = neutral_territories.choice(rng)
+            side = "player" if rng.random() < 0.5 else "ai"
+            recipient = self.sides[side]
+            other = self.ai if side == "player" else self.player
+            self.say(f"Diplomacy Meeting with {target_territory.name} for {recipient.name}!")
+            index = rng.randrange(len(QUESTIONS))
+            question_data = QUESTIONS[index]
+            self.say(f"Question: {question_data['question']}")
+            self.say(f"Options: 1) {question_data['answers'][0]}, 2) {question_data['answers'][1]}")
+            answer = self.policies[side].diplomacy_answer(self, question_data)
+            if answer == self.answers[index]:
+                self.say(f"Correct! {target_territory.name} joins {recipient.name}.")
+                self.conquer(target_territory, recipient)
+            else:
+                self.say(f"Incorrect! {target_territory.name} joins {other.name}.")
+                self.conquer(target_territory, other)
+
+    # Naval Assault: the AI strips up to 3 units from a player territory
+    def naval_assault(self):
+        rng = self.rng
+        if rng.random() < 1/3:
+            spartan_territories = self.owned[self.player]
+            if spartan_territories:
+                target = spartan_territories.choice(rng)
+                total_units = sum(target.units.values())
+                if total_units > 1:
+                    removed = remove_random_units(target.units, min(3, total_units - 1), self.unit_rng)
+                    self.unit_totals[self.player] -= removed
+                    self.say(f"AI launches Naval Assault on {target.name}! {removed} units lost.")
+                    self.show_state()
+
+    # European invasion; sets the winner if the Europeans take Greece outright
+    def european_invasion(self):
+        rng = self.rng
+        if rng.random() < 0.1:
+            outcome = rng.choice([1, 2, 3])
+            if outcome == 1:
+                self.say("The Europeans have conquered Greece. The Europeans have triumphed")
+                self.winner = "europeans"
+                return
+            victim = self.player if outcome == 2 else self.ai
+            victim_territories = self.owned[victim]
+            if victim_territories:
+                target = victim_territories.choice(rng)
+                self.say(f"Europeans conquer {target.name}!")
+                self.set_owner(target, self.europeans)
+                self.set_units(target, random_units(rng))
+
+    # European turn: one random attack on the player or the AI
+    def european_turn(self):
+        rng = self.rng
+        if self.owned[self.europeans]:
+            self.say("Europeans' turn")
+            possible_attacks = self.attacks_between(self.europeans, (self.player, self.ai))
+            if possible_attacks:
+                attack_from, target = rng.choice(possible_attacks)
+                k = rng.randint(1, sum(attack_from.units.values()) - 1)
+                self.say(f"Europeans attack from {attack_from.name} to {target.name} with {k} units")
+                self.resolve_attack("Europeans", attack_from, target, k, False)
+            else:
+                self.say("Europeans have no valid attacks this turn.")
+
+    # One full round; returns the winner once there is one
+    def play_round(self):
+        self.rounds += 1
+        for step in (self.player_turn, self.ai_turn, self.diplomacy_meeting, self.european_turn, self.european_invasion):
+            step()
+            if self.winner:
+                break
+        return self.winner
+
+    def run(self, max_rounds=MAX_ROUNDS):
+        while self.winner is None and self.rounds < max_rounds:
+            self.play_round()
+        return self.winner
+
+# Campaign constructors
+def conquest_campaign(seed=None, player_policy=None, ai_policy=None):
+    campaign = Campaign(seed, player_policy, ai_policy)
+    campaign.setup_conquest()
+    return campaign
+
+def custom_campaign(territory_names, adjacencies, seed=None, player_policy=None, ai_policy=None):
+    campaign = Campaign(seed, player_policy, ai_policy)
+    campaign.setup_custom(territory_names, adjacencies)
+    return campaign
+
+# Play seeded AI-vs-AI Conquest campaigns and tally the winners
+def run_campaigns(count, seed=0, max_rounds=MAX_ROUNDS, player_policy=None, ai_policy=None):
+    results = Counter()
+    rounds = 0
+    for i in range(count):
+        campaign = conquest_campaign(seed + i, player_policy, ai_policy)
+        results[campaign.run(max_rounds) or "unfinished"] += 1
+        rounds += campaign.rounds
+    return results, rounds
+
+def make_policy(name):
+    if name == "planner":
+        from legion_planner import PlannerPolicy
+        return PlannerPolicy()
+    return RandomPolicy()
+
+def main():
+    parser = argparse.ArgumentParser(description="Play headless AI-vs-AI Conquest campaigns.")
+    parser.add_argument("--campaigns", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-rounds", type=int, default=MAX_ROUNDS)
+    parser.add_argument("--player", choices=["random", "planner"], default="random")
+    parser.add_argument("--ai", choices=["random", "planner"], default="random")
+    args = parser.parse_args()
+    policies = [make_policy(args.player), make_policy(args.ai)]
+    start = time.perf_counter()
+    results, rounds = run_campaigns(args.campaigns, args.seed, args.max_rounds, *policies)
+    elapsed = time.perf_counter() - start
+    for policy in policies:
+        if hasattr(policy, "close"):
+            policy.close()
+    print(f"{args.campaigns} campaigns, {rounds} rounds in {elapsed:.2f}s")
+    for winner in ("player", "ai", "europeans", "unfinished"):
+        print(f"  {winner:10} {results[winner]:6} ({results[winner] / max(1, args.campaigns):.1%})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import argparse
+import math
+import random
+import time
+
+from legion_engine import custom_campaign
+from legion_planner import PlannerPolicy
+
+# Large maps for Custom mode: a compact text format, a seeded procedural
+# generator and a benchmark for how setup and whole games scale with size.
+#
+# Map files hold one territory per line, its name and then the line numbers
+# (0-based, counting territories only) of its neighbours:
+#
+#   # comments and blank lines are skipped
+#   Sparta|1 2
+#   Corinth|0 2
+#   Olympia|0 1
+#
+#   python legion_maps.py generate 5000 --seed 1 --output greece.map
+#   python legion_maps.py bench --sizes 100 1000 5000
+
+SYLLABLES = ["ar", "the", "cor", "spa", "del", "ol", "ym", "pyl", "lar", "is", "ka", "me", "ne", "phi", "rho", "tyr", "ag", "os"]
+DIAGONAL_CHANCE = 0.5  # Chance each grid cell gets one of its diagonals
+DROP_CHANCE = 0.1  # Chance a grid edge is left out, so the map isn't a perfect lattice
+
+# Read a map file and return (territory_names, adjacencies)
+def load_map(path):
+    names = []
+    neighbours = []
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            name, _, adj = line.partition("|")
+            name = name.strip()
+            try:
+                indices = [int(i) for i in adj.split()]
+            except ValueError:
+                raise ValueError(f"{path}:{line_number}: neighbours must be territory numbers")
+            if not name or "," in name:
+                raise ValueError(f"{path}:{line_number}: bad territory name {name!r}")
+            names.append(name)
+            neighbours.append((line_number, indices))
+    if len(set(names)) != len(names):
+        raise ValueError(f"{path}: territory names must be unique")
+    adjacencies = {}
+    for name, (line_number, indices) in zip(names, neighbours):
+        if any(i < 0 or i >= len(names) for i in indices):
+            raise ValueError(f"{path}:{line_number}: neighbour out of range 0-{len(names) - 1}")
+        adjacencies[name] = [names[i] for i in indices]
+    return names, adjacencies
+
+def save_map(path, territory_names, adjacencies):
+    index = {name: i for i, name in enumerate(territory_names)}
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"# Legion map, {len(territory_names)} territories\n")
+        for name in territory_names:
+            f.write(f"{name}|{' '.join(str(index[adj]) for adj in adjacencies.get(name, []))}\n")
+
+# Unique place names built from syllables
+def place_names(count, rng):
+    names = []
+    seen = set()
+    while len(names) < count:
+        name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+        if name in seen:
+            name = f"{name} {len(names)}"
+        seen.add(name)
+        names.append(name)
+    return names
+
+# Seeded planar-ish map: territories sit on a grid, each linked to its right
+# and lower neighbours (a few links dropped) and to one diagonal in about half
+# the cells. Diagonals never cross, so the map stays planar and no territory
+# has more than 6 neighbours, like a real one.
+def generate_map(count, seed=None):
+    rng = random.Random(seed)
+    columns = max(2, math.ceil(math.sqrt(count)))
+    names = place_names(count, rng)
+    links = [set() for _ in range(count)]
+
+    def connect(a, b):
+        if a < count and b < count:
+            links[a].add(b)
+            links[b].add(a)
+
+    for i in range(count):
+        column = i % columns
+        down = i + columns
+        if column + 1 < columns and rng.random() >= DROP_CHANCE:
+            connect(i, i + 1)
+        if rng.random() >= DROP_CHANCE:
+            connect(i, down)
+        if column + 1 < columns and rng.random() < DIAGONAL_CHANCE:
+            if rng.random() < 0.5:
+                connect(i, down + 1)
+            else:
+                connect(i + 1, down)
+    # Dropped links can cut a territory off; tie each one back to its grid neighbour
+    for i in range(count):
+        if not links[i]:
+            connect(i, i + 1 if i + 1 < count else i - 1)
+    return names, {names[i]: [names[j] for j in sorted(links[i])] for i in range(count)}
+
+# Time generation, a save/load round trip, setup and a whole AI-vs-AI game
+def bench(size, seed, max_rounds, path):
+    row = {"size": size}
+    start = time.perf_counter()
+    names, adjacencies = generate_map(size, seed)
+    row["generate"] = time.perf_counter() - start
+    save_map(path, names, adjacencies)
+    start = time.perf_counter()
+    names, adjacencies = load_map(path)
+    row["load"] = time.perf_counter() - start
+    start = time.perf_counter()
+    planner = PlannerPolicy()
+    campaign = custom_campaign(names, adjacencies, seed, ai_policy=planner)
+    row["setup"] = time.perf_counter() - start
+    start = time.perf_counter()
+    row["winner"] = campaign.run(max_rounds) or "unfinished"
+    row["game"] = time.perf_counter() - start
+    row["rounds"] = campaign.rounds
+    planner.close()
+    return row
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate Legion maps and benchmark large campaigns.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    generate = commands.add_parser("generate", help="write a procedural map file")
+    generate.add_argument("size", type=int)
+    generate.add_argument("--seed", type=int, default=None)
+    generate.add_argument("--output", default="legion.map")
+    timing = commands.add_parser("bench", help="time setup and a full AI-vs-AI game by map size")
+    timing.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000, 10000])
+    timing.add_argument("--seed", type=int, default=0)
+    timing.add_argument("--max-rounds", type=int, default=200)
+    timing.add_argument("--map-file", default="legion_bench.map")
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        names, adjacencies = generate_map(args.size, args.seed)
+        save_map(args.output, names, adjacencies)
+        print(f"Wrote {len(names)} territories to {args.output}")
+        return
+    print(f"{'size':>7} {'generate':>9} {'load':>8} {'setup':>8} {'game':>8} {'rounds':>7} {'ms/round':>9}  winner")
+    for size in args.sizes:
+        row = bench(size, args.seed, args.max_rounds, args.map_file)
+        print(f"{row['size']:7} {row['generate']:9.3f} {row['load']:8.3f} {row['setup']:8.3f} {row['game']:8.2f} "
+              f"{row['rounds']:7} {1000 * row['game'] / max(1, row['rounds']):9.2f}  {row['winner']}")
+
+if __name__ == "__main__":
+    main()
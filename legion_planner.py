@@ -0,0 +1,192 @@
+import multiprocessing
+import os
+import platform
+import time
+from collections import deque
+
+import numpy as np
+from legion_engine import UNIT_TYPES
+
+# Rollout-based attack planner for Conquest. Every (from, to, k, war cry)
+# candidate is scored by Monte Carlo rollouts of the battle rule; the plan
+# plays the best-scoring moves first and skips anything expected to lose value.
+#
+# A battle's outcome only depends on which k units get committed, so one
+# rollout is one multivariate hypergeometric draw and the rest follows from
+# resolve_battle's arithmetic; a whole batch of rollouts is a single numpy call.
+# rollout() restates that rule rather than calling resolve_battle, so a change
+# to either must be made to both; test_legion_planner.py checks they agree.
+# Results are memoized on (attacker units, defender units, k, war cry), which
+# repeat a lot on large maps where most garrisons are still the starting ones.
+#
+# Headless runs plan with no deadline, so a seeded campaign replays exactly;
+# the interactive game passes budget=TURN_BUDGET to keep each turn short.
+
+TURN_BUDGET = 0.25  # Seconds of planning per turn in the interactive game
+ROLLOUTS = 256
+TERRITORY_VALUE = 3  # Worth of taking a territory, in units
+POOL_MIN_CONFIGS = 2000  # Fewer new configurations than this are rolled out inline
+CHUNK_SIZE = 256
+CHUNKS_PER_WORKER = 2  # Chunks queued per pool worker; more only piles up past a deadline
+CACHE_SIZE = 200000
+
+# Unit type index -> index of the type it beats (see legion_engine.BEATS)
+BEATEN = np.array([1, 2, 0])
+
+# Roll out one configuration and return (capture chance, expected own units,
+# expected enemy units) over the attacking and defending territories afterwards
+def rollout(config, rollouts, unit_rng):
+    attacker, defender, k, use_war_cry = config
+    committed = unit_rng.multivariate_hypergeometric(attacker, k, size=rollouts)
+    present = committed > 0
+    defender_present = np.array(defender) > 0
+    attacker_advantage = (present & defender_present[BEATEN]).sum(axis=1)
+    defender_advantage = (present[:, BEATEN] & defender_present).sum(axis=1)
+    A = k + attacker_advantage + (1 if use_war_cry else 0)
+    D = sum(defender) + defender_advantage
+    won = A > D
+    tied = A == D
+    captured = won | tied if use_war_cry else won
+    # A war cry tie takes the territory with one unit but, like a loss, sends
+    # the committed units back home in place of the rest
+    own = np.where(won, sum(attacker) - k + np.minimum(k, np.maximum(1, A - D)), np.where(captured, k + 1, k))
+    enemy = np.where(captured, 0, np.where(tied, 1, np.maximum(1, D - A)))
+    return float(captured.mean()), float(own.mean()), float(enemy.mean())
+
+# Roll out a chunk of configurations; runs inside a worker process
+def rollout_chunk(task):
+    configs, rollouts, seed = task
+    unit_rng = np.random.default_rng(seed)
+    return [(config, rollout(config, rollouts, unit_rng)) for config in configs]
+
+def units_key(units):
+    return tuple(units[unit] for unit in UNIT_TYPES)
+
+# Value change of a move for the attacking side, in units
+def move_score(config, stats):
+    attacker, defender, k, use_war_cry = config
+    capture_chance, own, enemy = stats
+    return (own - sum(attacker)) + (sum(defender) - enemy) + capture_chance * TERRITORY_VALUE
+
+# Commitments worth trying: everything but one, and just enough to outnumber
+# the defence with a little to spare
+def candidate_ks(attacker_total, defender_total):
+    most = attacker_total - 1
+    return sorted({most, min(most, defender_total + 1), min(most, defender_total + 3)})
+
+class PlannerPolicy:
+    interactive = False
+
+    def __init__(self, budget=None, rollouts=ROLLOUTS, processes=None):
+        self.budget = budget  # Seconds per turn, or None to roll out every candidate
+        self.rollouts = rollouts
+        self.processes = processes  # None uses every core, 0 never starts a pool
+        self.pool = None
+        # Rollouts draw their seeds from the campaign's rng, so cached results
+        # only stay valid within the campaign that produced them
+        self.cache = {}
+        self.cache_campaign = None
+
+    def close(self):
+        if self.pool:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+        self.cache.clear()
+        self.cache_campaign = None
+
+    # Candidate moves from the current position, as (from, to, config)
+    def candidates(self, campaign, side):
+        owner = campaign.sides[side]
+        war_cries = (False, True) if owner.war_cry_cooldown == 0 else (False,)
+        moves = []
+        for attack_from, target in campaign.possible_attacks(side):
+            attacker = units_key(attack_from.units)
+            defender = units_key(target.units)
+            for k in candidate_ks(sum(attacker), sum(defender)):
+                for use_war_cry in war_cries:
+                    moves.append((attack_from, target, (attacker, defender, k, use_war_cry)))
+        return moves
+
+    # Fill the cache for the given configurations, most promising first, until
+    # the deadline if there is one
+    def evaluate(self, campaign, configs, deadline):
+        if campaign is not self.cache_campaign:
+            self.cache.clear()
+            self.cache_campaign = campaign
+        pending = sorted({config for config in configs if config not in self.cache},
+                         key=lambda config: sum(config[1]) - config[2])
+        if not pending:
+            return
+        if len(self.cache) + len(pending) > CACHE_SIZE:
+            self.cache.clear()
+        chunks = [(pending[i:i + CHUNK_SIZE], self.rollouts, campaign.rng.getrandbits(32))
+                  for i in range(0, len(pending), CHUNK_SIZE)]
+        use_pool = self.processes != 0 and len(pending) >= POOL_MIN_CONFIGS and platform.system() != "Emscripten"
+        if use_pool and self.pool is None:
+            self.pool = multiprocessing.Pool(self.processes)
+        for chunk in self.rollout_chunks(chunks, use_pool, deadline):
+            self.cache.update(chunk)
+
+    # Roll out chunks inline or on the pool, a few per worker at a time. The
+    # deadline is checked before each chunk starts, and whatever is already in
+    # the pool is collected before returning, so no work outlives the turn.
+    def rollout_chunks(self, chunks, use_pool, deadline):
+        in_flight = deque()
+        limit = CHUNKS_PER_WORKER * (self.processes or os.cpu_count() or 1)
+        for chunk in chunks:
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+            if not use_pool:
+                yield rollout_chunk(chunk)
+                continue
+            in_flight.append(self.pool.apply_async(rollout_chunk, (chunk,)))
+            if len(in_flight) >= limit:
+                yield in_flight.popleft().get()
+        while in_flight:
+            yield in_flight.popleft().get()
+
+    def attack_orders(self, campaign, side):
+        deadline = None if self.budget is None else time.perf_counter() + self.budget
+        owner = campaign.sides[side]
+        moves = self.candidates(campaign, side)
+        self.evaluate(campaign, [config for _, _, config in moves], deadline)
+        plan = sorted(((move_score(config, self.cache[config]), attack_from, target, config)
+                       for attack_from, target, config in moves if config in self.cache),
+                      key=lambda move: move[0], reverse=True)
+        touched = set()
+        for score, attack_from, target, config in plan:
+            if score <= 0:
+                break
+            if attack_from.owner != owner or target.owner == owner:
+                continue
+            if attack_from in touched or target in touched:
+                # An earlier battle this turn changed one end; rescore it as it stands
+                best = self.best_move(campaign, owner, attack_from, target, deadline)
+                if best is None:
+                    continue
+                config = best
+            elif config[3] and owner.war_cry_cooldown != 0:
+                continue
+            touched.add(attack_from)
+            touched.add(target)
+            yield attack_from, target, config[2], config[3]
+
+    # Best positive-scoring config for one pair in its current state
+    def best_move(self, campaign, owner, attack_from, target, deadline):
+        attacker = units_key(attack_from.units)
+        defender = units_key(target.units)
+        if sum(attacker) < 2:
+            return None
+        war_cries = (False, True) if owner.war_cry_cooldown == 0 else (False,)
+        configs = [(attacker, defender, k, use_war_cry)
+                   for k in candidate_ks(sum(attacker), sum(defender)) for use_war_cry in war_cries]
+        self.evaluate(campaign, configs, deadline)
+        scored = [(move_score(config, self.cache[config]), config) for config in configs if config in self.cache]
+        if not scored:
+            return None
+        score, config = max(scored)
+        return config if score > 0 else None
+
+    def diplomacy_answer(self, campaign, question):
+        return campaign.rng.choice([0, 1])
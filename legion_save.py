@@ -0,0 +1,243 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import queue
+import struct
+import threading
+import time
+
+import numpy as np
+from legion_engine import UNIT_TYPES, Campaign, Territory
+
+# Campaign snapshots for Conquest and Custom modes. One file holds the whole
+# state: map, units, owners, players and both random generators, so a resumed
+# campaign plays out exactly as it would have. Layout, little-endian:
+#
+#   header     magic, version, then byte lengths of the metadata and names
+#              and the territory and adjacency-entry counts
+#   metadata   JSON: seed, rounds, winner, diplomacy answers, each player's
+#              conquered count and war cry cooldown, and the random states
+#   names      territory names, newline-separated UTF-8
+#   owners     u1 per territory, an index into players
+#   neutral    u1 per territory
+#   units      u4 per territory per unit type
+#   offsets    u4 per territory + 1, where each territory's neighbours start
+#   neighbours u4 per adjacency entry, territory numbers
+#   mt         u4 x 625, the Mersenne Twister state of campaign.rng
+#   owned      u4 per territory, each player's territories in index order
+#   frontier   u4 pairs, each (owner, enemy) frontier's edges in index order
+#
+# The indexes' order decides which territory a seeded random pick lands on,
+# so it is saved rather than rebuilt; the metadata holds the section sizes.
+# The map sections never change during a campaign, so SaveWriter packs them
+# once and reuses them for every checkpoint.
+#
+#   python legion_save.py legion_save.bin   (summarise a save)
+
+SAVE_PATH = "legion_save.bin"
+MAGIC = b"LGNS"
+VERSION = 1
+HEADER = struct.Struct("<4sHIIII")
+MT_WORDS = 625
+
+def players_of(campaign):
+    return [campaign.player, campaign.ai, campaign.neutral, campaign.europeans]
+
+def frontier_keys(players):
+    return [(owner, enemy) for owner in players for enemy in players if owner != enemy]
+
+# Names and adjacency in CSR form, the parts of a save that never change,
+# plus the territory numbering the rest of the save uses
+def pack_graph(campaign):
+    territories = list(campaign.territories.values())
+    number = {territory: i for i, territory in enumerate(territories)}
+    offsets = np.zeros(len(territories) + 1, dtype="<u4")
+    neighbours = []
+    for i, territory in enumerate(territories):
+        neighbours.extend(number[adj] for adj in territory.adjacent)
+        offsets[i + 1] = len(neighbours)
+    names = "\n".join(t.name for t in territories).encode("utf-8")
+    return names, offsets.tobytes(), np.array(neighbours, dtype="<u4").tobytes(), len(neighbours), number
+
+def pack_campaign(campaign, graph=None):
+    names, offsets, neighbours, edges, number = graph or pack_graph(campaign)
+    players = players_of(campaign)
+    owner_code = {owner: i for i, owner in enumerate(players)}
+    territories = campaign.territories.values()
+    owners = np.fromiter((owner_code[t.owner] for t in territories), dtype="u1", count=len(campaign.territories))
+    neutral = np.fromiter((t.is_neutral for t in territories), dtype="u1", count=len(campaign.territories))
+    units = np.array([[t.units[unit] for unit in UNIT_TYPES] for t in territories], dtype="<u4").reshape(-1, len(UNIT_TYPES))
+    owned = [number[t] for owner in players for t in campaign.owned[owner]]
+    frontier = [number[t] for key in frontier_keys(players) for edge in campaign.frontier[key] for t in edge]
+    version, mt, gauss_next = campaign.rng.getstate()
+    meta = json.dumps({
+        "seed": campaign.seed,
+        "rounds": campaign.rounds,
+        "winner": campaign.winner,
+        "answers": campaign.answers,
+        "players": [[p.conquered, p.war_cry_cooldown] for p in players],
+        "random": [version, gauss_next],
+        "unit_rng": campaign.unit_rng.bit_generator.state,
+        "owned": [len(campaign.owned[owner]) for owner in players],
+        "frontier": [len(campaign.frontier[key]) for key in frontier_keys(players)],
+    }).encode("utf-8")
+    return b"".join([
+        HEADER.pack(MAGIC, VERSION, len(meta), len(names), len(campaign.territories), edges),
+        meta, names, owners.tobytes(), neutral.tobytes(), units.tobytes(), offsets, neighbours,
+        np.array(mt, dtype="<u4").tobytes(),
+        np.array(owned, dtype="<u4").tobytes(), np.array(frontier, dtype="<u4").tobytes(),
+    ])
+
+def unpack_campaign(data, player_policy=None, ai_policy=None):
+    magic, version, meta_size, names_size, count, edges = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not a Legion campaign save")
+    pos = HEADER.size
+
+    def take(size, dtype=None, shape=None):
+        nonlocal pos
+        chunk = data[pos:pos + size] if dtype is None else np.frombuffer(data, dtype, size, pos)
+        pos += size if dtype is None else chunk.nbytes
+        return chunk if shape is None else chunk.reshape(shape)
+
+    meta = json.loads(take(meta_size))
+    names = take(names_size).decode("utf-8").split("\n") if count else []
+    owners = take(count, "u1")
+    neutral = take(count, "u1").tolist()
+    units = take(count * len(UNIT_TYPES), "<u4", (count, len(UNIT_TYPES)))
+    offsets = take(count + 1, "<u4")
+    neighbours = take(edges, "<u4")
+    mt = take(MT_WORDS, "<u4").tolist()
+    owned = take(count, "<u4").tolist()
+    frontier = take(2 * sum(meta["frontier"]), "<u4").tolist()
+
+    campaign = Campaign(meta["seed"], player_policy, ai_policy)
+    players = players_of(campaign)
+    for player, (conquered, cooldown) in zip(players, meta["players"]):
+        player.conquered = conquered
+        player.war_cry_cooldown = cooldown
+    # Territories and indexes are built a whole array at a time; a 10k map
+    # makes tens of thousands of objects, so the collector is paused meanwhile
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        territories = [Territory(name, is_neutral == 1) for name, is_neutral in zip(names, neutral)]
+        for territory, owner, (swordsmen, spearmen, archers) in zip(territories, map(players.__getitem__, owners.tolist()),
+                                                                    units.tolist()):
+            territory.owner = owner
+            territory.units = {"swordsman": swordsmen, "spearman": spearmen, "archer": archers}
+        # Adjacency lists are slices of one list of neighbour territories; the
+        # incoming lists are the same edges grouped by destination, sources in
+        # map order as build_indexes would list them
+        neighbour_list = list(map(territories.__getitem__, neighbours.tolist()))
+        bounds = offsets.tolist()
+        for territory, start, end in zip(territories, bounds, bounds[1:]):
+            territory.adjacent = neighbour_list[start:end]
+        sources = np.repeat(np.arange(count), np.diff(offsets))
+        by_destination = np.argsort(neighbours, kind="stable")
+        source_list = list(map(territories.__getitem__, sources[by_destination].tolist()))
+        bounds = np.concatenate(([0], np.cumsum(np.bincount(neighbours, minlength=count)))).tolist()
+        incoming = {territory: source_list[start:end] for territory, start, end in zip(territories, bounds, bounds[1:])}
+        totals = np.bincount(owners, weights=units.sum(axis=1), minlength=len(players)).astype(int).tolist()
+        unit_totals = dict(zip(players, totals))
+        campaign.territories = {t.name: t for t in territories}
+        owned_order = {}
+        start = 0
+        for owner, size in zip(players, meta["owned"]):
+            owned_order[owner] = list(map(territories.__getitem__, owned[start:start + size]))
+            start += size
+        frontier_order = {}
+        start = 0
+        for key, size in zip(frontier_keys(players), meta["frontier"]):
+            ends = list(map(territories.__getitem__, frontier[start:start + 2 * size]))
+            frontier_order[key] = list(zip(ends[0::2], ends[1::2]))
+            start += 2 * size
+        campaign.build_indexes(owned_order, frontier_order, unit_totals, incoming)
+    finally:
+        if collecting:
+            gc.enable()
+    campaign.rounds = meta["rounds"]
+    campaign.winner = meta["winner"]
+    campaign.answers = meta["answers"]
+    version, gauss_next = meta["random"]
+    campaign.rng.setstate((version, tuple(mt), gauss_next))
+    campaign.unit_rng.bit_generator.state = meta["unit_rng"]
+    return campaign
+
+def save_campaign(campaign, path=SAVE_PATH):
+    write_atomic(path, pack_campaign(campaign))
+
+def load_campaign(path=SAVE_PATH, player_policy=None, ai_policy=None):
+    with open(path, "rb") as f:
+        return unpack_campaign(f.read(), player_policy, ai_policy)
+
+# Write to a temporary file and swap it in, so a crash mid-write leaves the
+# previous checkpoint intact
+def write_atomic(path, data):
+    temp = path + ".tmp"
+    with open(temp, "wb") as f:
+        f.write(data)
+    os.replace(temp, path)
+
+# Checkpoints a campaign between turns. Snapshots are packed on the game
+# thread and written by a background thread; if turns outpace the disk only
+# the newest snapshot is written.
+class SaveWriter:
+    def __init__(self, path=SAVE_PATH):
+        self.path = path
+        self.graph = None
+        self.graph_campaign = None
+        self.queue = queue.SimpleQueue()
+        # Browsers have no threads, so snapshots are written inline there
+        self.thread = None
+        if platform.system() != "Emscripten":
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+    def save(self, campaign):
+        if self.graph_campaign is not campaign:
+            self.graph = pack_graph(campaign)
+            self.graph_campaign = campaign
+        data = pack_campaign(campaign, self.graph)
+        if self.thread is None:
+            write_atomic(self.path, data)
+        else:
+            self.queue.put(data)
+
+    def _run(self):
+        while True:
+            chunks = [self.queue.get()]
+            while not self.queue.empty():
+                chunks.append(self.queue.get())
+            # Only the newest snapshot is worth writing
+            snapshots = [c for c in chunks if c is not None]
+            if snapshots:
+                write_atomic(self.path, snapshots[-1])
+            if chunks[-1] is None:
+                return
+
+    # Wait for pending writes; with discard=True the save is removed afterwards
+    def close(self, discard=False):
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+        if discard and os.path.exists(self.path):
+            os.remove(self.path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarise a Legion campaign save.")
+    parser.add_argument("path", nargs="?", default=SAVE_PATH)
+    args = parser.parse_args()
+    start = time.perf_counter()
+    campaign = load_campaign(args.path)
+    elapsed = time.perf_counter() - start
+    print(f"{args.path}: {os.path.getsize(args.path)} bytes, loaded in {elapsed * 1000:.1f} ms")
+    print(f"  {len(campaign.territories)} territories, round {campaign.rounds}, winner {campaign.winner or 'none yet'}")
+    for owner in players_of(campaign):
+        print(f"  {owner.name:10} {len(campaign.owned[owner]):6} territories {campaign.unit_totals[owner]:8} units")
+
+if __name__ == "__main__":
+    main()
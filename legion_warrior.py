@@ -0,0 +1,318 @@
+# Display-free helpers for Warrior mode. legion.py owns the pygame loop and
+# the Entity and Terrain classes; this module holds the data structures that
+# let a battle scale past a few dozen units.
+
+from collections import OrderedDict
+
+import numpy as np
+
+TERRAIN_CELL = 60  # Terrain blocks are 30px
+ENTITY_CELL = 40  # Entities are 20px
+ARRAY_WORLD_MIN = 500  # Battles with at least this many enemies use WarriorWorld
+ALLIES = 0
+ENEMIES = 1
+FLOW_CELL = 10  # Flow field grid spacing in px
+FLOW_CACHE = 64  # Flow fields kept, one per recent target cell
+TARGET_FRAMES = 30  # Frames a unit sticks with its target before looking again
+
+# Grid steps as (dy, dx), straight ones first so ties prefer them
+STEPS = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]
+
+# Uniform-grid spatial hash over square objects with x, y and size. Each object
+# is filed under the cell of its top-left corner only, so queries widen their
+# search by max_size up and to the left instead of deduplicating results.
+class SpatialHash:
+    def __init__(self, cell_size, max_size, items=()):
+        self.cell_size = cell_size
+        self.max_size = max_size
+        self.cells = {}
+        for item in items:
+            self.insert(item)
+
+    def clear(self):
+        self.cells.clear()
+
+    def insert(self, item):
+        key = (int(item.x // self.cell_size), int(item.y // self.cell_size))
+        bucket = self.cells.get(key)
+        if bucket is None:
+            self.cells[key] = [item]
+        else:
+            bucket.append(item)
+
+    # Everything that might overlap the rectangle; callers still test exactly
+    def near(self, x, y, w, h):
+        cell_size = self.cell_size
+        x0 = int((x - self.max_size) // cell_size)
+        x1 = int((x + w) // cell_size)
+        y0 = int((y - self.max_size) // cell_size)
+        y1 = int((y + h) // cell_size)
+        cells = self.cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    yield from bucket
+
+    # Objects whose square overlaps the size x size square at (x, y)
+    def overlapping(self, x, y, size):
+        for item in self.near(x, y, size, size):
+            if item.x < x + size and x < item.x + item.size and item.y < y + size and y < item.y + item.size:
+                yield item
+
+    def blocked(self, x, y, size):
+        return next(self.overlapping(x, y, size), None) is not None
+
+    # Item whose top-left corner is nearest (x, y), searching rings of cells
+    # outward and stopping once no further ring could hold anything closer.
+    # None if nothing is within max_rings cells.
+    def nearest(self, x, y, max_rings):
+        cell_size = self.cell_size
+        cx = int(x // cell_size)
+        cy = int(y // cell_size)
+        best = None
+        best_distance = float("inf")
+        for ring in range(max_rings + 1):
+            # Everything in this ring is at least ring - 1 whole cells away
+            if best is not None and best_distance <= ((ring - 1) * cell_size) ** 2:
+                break
+            for key in ring_cells(cx, cy, ring):
+                for item in self.cells.get(key, ()):
+                    distance = (item.x - x) ** 2 + (item.y - y) ** 2
+                    if distance < best_distance:
+                        best = item
+                        best_distance = distance
+        return best
+
+# Cells on the square ring the given number of cells out from (cx, cy)
+def ring_cells(cx, cy, ring):
+    if ring == 0:
+        yield cx, cy
+        return
+    for dx in range(-ring, ring + 1):
+        yield cx + dx, cy - ring
+        yield cx + dx, cy + ring
+    for dy in range(-ring + 1, ring):
+        yield cx - ring, cy + dy
+        yield cx + ring, cy + dy
+
+# Keep a unit on its target until the target dies or the commitment runs out,
+# then ask pick(unit) for a new one. Commitments last between half and all of
+# frames, so a crowd doesn't re-target on the same frame.
+def committed_target(unit, frame, pick, rng, frames=TARGET_FRAMES):
+    target = unit.target
+    if target is None or not target.alive or frame >= unit.retarget_at:
+        target = pick(unit)
+        unit.target = target
+        unit.retarget_at = frame + rng.randint(frames // 2, frames)
+    return target
+
+# Struct-of-arrays store for Warrior mode entities: one slot per entity in
+# each of x, y, speed, size, alive and team. Crowds are moved and hit-tested
+# with whole-array operations; Entity objects become thin views onto a slot.
+class WarriorWorld:
+    FIELDS = ("x", "y", "speed", "size", "alive", "team", "target", "retarget_at")
+
+    def __init__(self, capacity=64, seed=None):
+        self.rng = np.random.default_rng(seed)
+        self.count = 0
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.speed = np.zeros(capacity)
+        self.size = np.zeros(capacity)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.team = np.zeros(capacity, dtype=np.int8)
+        self.target = np.zeros(capacity, dtype=np.int64)  # Committed target slot, -1 for none
+        self.retarget_at = np.zeros(capacity, dtype=np.int64)
+        self.terrain = np.zeros((0, 3))
+
+    def add(self, x, y, team, speed, size):
+        if self.count == len(self.x):
+            for field in self.FIELDS:
+                array = getattr(self, field)
+                setattr(self, field, np.concatenate([array, np.zeros_like(array)]))
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.speed[i] = speed
+        self.size[i] = size
+        self.alive[i] = True
+        self.team[i] = team
+        self.target[i] = -1
+        self.retarget_at[i] = 0
+        self.count += 1
+        return i
+
+    def set_terrain(self, terrain):
+        self.terrain = np.array([(t.x, t.y, t.size) for t in terrain], dtype=float).reshape(-1, 3)
+
+    # Which of the given squares overlap a terrain block
+    def blocked(self, xs, ys, sizes):
+        if not len(self.terrain):
+            return np.zeros(len(xs), dtype=bool)
+        tx, ty, ts = self.terrain[:, 0], self.terrain[:, 1], self.terrain[:, 2]
+        xs, ys, sizes = xs[:, None], ys[:, None], sizes[:, None]
+        return ((tx < xs + sizes) & (xs < tx + ts) & (ty < ys + sizes) & (ys < ty + ts)).any(axis=1)
+
+    # Batched Entity.move_towards: step each entity up to its speed along both
+    # axes, and where that runs into terrain slide along x or else y
+    def move_towards(self, indices, target_x, target_y):
+        x = self.x[indices]
+        y = self.y[indices]
+        speed = self.speed[indices]
+        size = self.size[indices]
+        new_x = x + np.clip(target_x - x, -speed, speed)
+        new_y = y + np.clip(target_y - y, -speed, speed)
+        stuck = np.flatnonzero(self.blocked(new_x, new_y, size))
+        if len(stuck):
+            slide_x = ~self.blocked(new_x[stuck], y[stuck], size[stuck])
+            slide_y = ~slide_x & ~self.blocked(x[stuck], new_y[stuck], size[stuck])
+            new_x[stuck] = np.where(slide_x, new_x[stuck], x[stuck])
+            new_y[stuck] = np.where(slide_y, new_y[stuck], y[stuck])
+        self.x[indices] = new_x
+        self.y[indices] = new_y
+
+    # Slots of live entities on team whose square overlaps the size x size square at (x, y)
+    def overlapping(self, x, y, size, team):
+        n = self.count
+        ex, ey = self.x[:n], self.y[:n]
+        return np.flatnonzero(self.alive[:n] & (self.team[:n] == team) &
+                              (ex < x + size) & (x < ex + self.size[:n]) & (ey < y + size) & (y < ey + self.size[:n]))
+
+    def living(self, team):
+        n = self.count
+        return np.flatnonzero(self.alive[:n] & (self.team[:n] == team))
+
+    # Slot of the live entity on team whose top-left corner is nearest (x, y), or None
+    def nearest(self, x, y, team):
+        live = self.living(team)
+        if not len(live):
+            return None
+        return int(live[((self.x[live] - x) ** 2 + (self.y[live] - y) ** 2).argmin()])
+
+    # Batched committed targeting. Each chaser keeps its target slot until the
+    # target dies or the commitment runs out; then it goes for the controlled
+    # slot half the time and the nearest candidate slot otherwise, falling back
+    # to whichever exists. Only the chasers due a new target do any work, and
+    # candidates are the handful of teammates. Returns the target slots.
+    def chase_targets(self, chasers, controlled, candidates, frame, frames=TARGET_FRAMES):
+        targets = self.target[chasers]
+        due = (targets < 0) | (frame >= self.retarget_at[chasers])
+        due[~due] = ~self.alive[targets[~due]]
+        picking = chasers[due]
+        if len(picking):
+            if len(candidates):
+                dx = self.x[picking, None] - self.x[candidates]
+                dy = self.y[picking, None] - self.y[candidates]
+                picks = candidates[(dx * dx + dy * dy).argmin(axis=1)]
+                if controlled is not None:
+                    picks[self.rng.random(len(picking)) < 0.5] = controlled
+            else:
+                picks = np.full(len(picking), controlled)
+            self.target[picking] = picks
+            self.retarget_at[picking] = frame + self.rng.integers(frames // 2, frames + 1, size=len(picking))
+            targets[due] = picks
+        return targets
+
+# Flow fields for chasing a target around terrain. The arena is cut into
+# FLOW_CELL squares, and a cell is open if an entity standing on its corner
+# touches no terrain. For a target cell, a breadth-first wavefront over the
+# open cells gives each cell its distance to the target, and each cell keeps
+# the step toward its nearest neighbour. Every chaser of that target reads its
+# next waypoint from the same field, so pathing costs one lookup per entity
+# however many units chase. Fields are cached by target cell and only rebuilt
+# when a target moves into a cell with no cached field.
+class FlowFields:
+    def __init__(self, width, height, terrain, size, cell=FLOW_CELL):
+        self.cell = cell
+        self.cols = width // cell
+        self.rows = height // cell
+        ys, xs = np.mgrid[0:self.rows, 0:self.cols] * cell
+        open_cells = (xs + size <= width) & (ys + size <= height)
+        for t in terrain:
+            open_cells &= ~((t.x < xs + size) & (xs < t.x + t.size) & (t.y < ys + size) & (ys < t.y + t.size))
+        self.open = open_cells
+        # moves[step]: cells where taking that step lands on an open cell
+        # without clipping the corner of a closed one
+        padded = self.padded(open_cells)
+        self.moves = {}
+        for dy, dx in STEPS:
+            ok = self.neighbour(padded, dy, dx)
+            if dy and dx:
+                ok = ok & self.neighbour(padded, dy, 0) & self.neighbour(padded, 0, dx)
+            self.moves[(dy, dx)] = ok
+        self.fields = OrderedDict()
+
+    def padded(self, array, fill=False):
+        out = np.full((self.rows + 2, self.cols + 2), fill, dtype=array.dtype)
+        out[1:-1, 1:-1] = array
+        return out
+
+    # For every cell c, the padded array's value at c + (dy, dx)
+    def neighbour(self, padded, dy, dx):
+        return padded[1 + dy:1 + dy + self.rows, 1 + dx:1 + dx + self.cols]
+
+    def cell_of(self, x, y):
+        return (min(max(int(y // self.cell), 0), self.rows - 1), min(max(int(x // self.cell), 0), self.cols - 1))
+
+    # (step_y, step_x) arrays toward the target cell; (0, 0) means head straight
+    # for the target, either because it's this cell or because it can't be reached
+    def field(self, target):
+        field = self.fields.get(target)
+        if field is not None:
+            self.fields.move_to_end(target)
+            return field
+        dist = np.full((self.rows, self.cols), np.inf)
+        reached = np.zeros((self.rows, self.cols), dtype=bool)
+        reached[target] = True
+        frontier = reached.copy()
+        dist[target] = 0
+        step = 0
+        while frontier.any():
+            step += 1
+            padded = self.padded(frontier)
+            grown = np.zeros_like(frontier)
+            for dy, dx in STEPS:
+                grown |= self.moves[(dy, dx)] & self.neighbour(padded, dy, dx)
+            frontier = grown & self.open & ~reached
+            reached |= frontier
+            dist[frontier] = step
+        padded = self.padded(dist, np.inf)
+        options = np.stack([np.where(self.moves[s], self.neighbour(padded, *s), np.inf) for s in STEPS])
+        best = options.argmin(axis=0)
+        go = np.take_along_axis(options, best[None], axis=0)[0] < dist
+        steps = np.array(STEPS, dtype=np.int8)
+        field = (np.where(go, steps[best, 0], 0).astype(np.int8), np.where(go, steps[best, 1], 0).astype(np.int8))
+        self.fields[target] = field
+        if len(self.fields) > FLOW_CACHE:
+            self.fields.popitem(last=False)
+        return field
+
+    # Where an entity at (x, y) should head next on its way to (target_x, target_y)
+    def waypoint(self, x, y, target_x, target_y):
+        step_y, step_x = self.field(self.cell_of(target_x, target_y))
+        cy, cx = self.cell_of(x, y)
+        dy, dx = int(step_y[cy, cx]), int(step_x[cy, cx])
+        if not dy and not dx:
+            return target_x, target_y
+        return (cx + dx) * self.cell, (cy + dy) * self.cell
+
+    # Batched waypoint for many entities, one field per distinct target cell
+    def waypoints(self, xs, ys, target_x, target_y):
+        cell = self.cell
+        cx = np.clip((xs // cell).astype(int), 0, self.cols - 1)
+        cy = np.clip((ys // cell).astype(int), 0, self.rows - 1)
+        tcx = np.clip((target_x // cell).astype(int), 0, self.cols - 1)
+        tcy = np.clip((target_y // cell).astype(int), 0, self.rows - 1)
+        keys = tcy * self.cols + tcx
+        way_x = np.array(target_x, dtype=float)
+        way_y = np.array(target_y, dtype=float)
+        for key in np.unique(keys):
+            chasing = np.flatnonzero(keys == key)
+            step_y, step_x = self.field(divmod(int(key), self.cols))
+            dy = step_y[cy[chasing], cx[chasing]]
+            dx = step_x[cy[chasing], cx[chasing]]
+            routed = (dy != 0) | (dx != 0)
+            way_x[chasing] = np.where(routed, (cx[chasing] + dx) * cell, way_x[chasing])
+            way_y[chasing] = np.where(routed, (cy[chasing] + dy) * cell, way_y[chasing])
+        return way_x, way_y
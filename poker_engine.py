@@ -0,0 +1,416 @@
+import random
+from collections import deque
+from enum import Enum
+
+import numpy as np
+from poker_eval import NUM_CARDS, card_code, evaluate, estimate_equity, hand_strength, hand_name, preflop_equity
+from poker_stats import DEFAULT_FOLD_TO_RAISE
+
+# Display-free Texas Hold'em engine. poker.py draws it with pygame; simulations
+# and tournaments drive it directly. The engine works on int card codes from
+# poker_eval (hands, board and deck are plain lists of ints, the board is also
+# kept as a 64-bit mask); Card objects are only built for display.
+
+BETTING_PHASES = ("preflop", "flop", "turn", "river")
+LOG_LINES = 50  # The table log is a ring buffer; full history goes to poker_history.py
+
+# Card and game enums
+class Suit(Enum):
+    HEARTS = "H"
+    DIAMONDS = "D"
+    CLUBS = "C"
+    SPADES = "S"
+
+SUIT_INDEX = {suit: i for i, suit in enumerate(Suit)}
+
+class Rank(Enum):
+    TWO = 2
+    THREE = 3
+    FOUR = 4
+    FIVE = 5
+    SIX = 6
+    SEVEN = 7
+    EIGHT = 8
+    NINE = 9
+    TEN = 10
+    JACK = 11
+    QUEEN = 12
+    KING = 13
+    ACE = 14
+
+SUITS = list(Suit)
+RANKS = list(Rank)
+
+class AIDifficulty(Enum):
+    BEGINNER = 1
+    EASY = 2
+    MEDIUM = 3
+    HARD = 4
+    MASTER = 5
+
+# Monte Carlo budget per AI decision: (samples, seconds). The seconds cap only
+# applies when the engine's time_budgets is on, i.e. for a frame-bound front end;
+# headless runs use the sample count alone so seeded results are reproducible.
+EQUITY_BUDGETS = {
+    AIDifficulty.MEDIUM: (300, 0.002),
+    AIDifficulty.HARD: (1000, 0.004),
+    AIDifficulty.MASTER: (2000, 0.006),
+}
+# Flat sample count for bulk simulation, set through PokerEngine.equity_samples.
+# Postflop Monte Carlo is most of an equity AI's decision time.
+BULK_EQUITY_SAMPLES = 128
+
+# Card class, used at the display boundary
+class Card:
+    def __init__(self, rank, suit):
+        self.rank = rank
+        self.suit = suit
+        self.code = card_code(rank.value - 2, SUIT_INDEX[suit])
+
+    def __str__(self):
+        rank_str = {11: 'J', 12: 'Q', 13: 'K', 14: 'A'}.get(self.rank.value, str(self.rank.value))
+        return f"{rank_str}{self.suit.value}"
+
+def card_from_code(code):
+    return Card(RANKS[code >> 2], SUITS[code & 3])
+
+CARD_NAMES = [str(card_from_code(code)) for code in range(NUM_CARDS)]
+
+# Player class
+class Player:
+    def __init__(self, name, chips=1000):
+        self.name = name
+        self.chips = chips
+        self.hand = []
+        self.folded = False
+        self.current_bet = 0
+
+    # Hand value from the lookup tables; higher beats lower, equal splits
+    def evaluate_hand(self, community_cards):
+        return evaluate(self.hand + community_cards)
+
+# AI Player class
+class AIPlayer(Player):
+    def __init__(self, name, difficulty, chips=1000):
+        super().__init__(name, chips)
+        self.difficulty = difficulty
+
+    def decide_action(self, game_state, pot, current_bet):
+        choice, raise_amount = self.choose_action(game_state, pot, current_bet)
+        return self.apply_action(choice, raise_amount, current_bet)
+
+    # Pick an action without touching any game state, so it can run off the
+    # main thread. Returns (choice, raise_amount).
+    def choose_action(self, game_state, pot, current_bet):
+        if current_bet > self.current_bet + self.chips:
+            return "cant_call", 0
+
+        rng = game_state.rng
+
+        pot_odds = current_bet / (pot + current_bet) if pot + current_bet > 0 else 0
+        early_round = len(game_state.community_cards) < 3
+
+        if self.difficulty in (AIDifficulty.BEGINNER, AIDifficulty.EASY):
+            strength = hand_strength(self.evaluate_hand(game_state.community_cards))
+        else:
+            # Real win probability against the opponents still in the hand
+            opponents = max(1, len(game_state.get_active_players()) - 1)
+            hole = self.hand
+            equity = preflop_equity(hole, opponents) if not game_state.community_cards else None
+            if equity is None:
+                samples, time_budget = EQUITY_BUDGETS[self.difficulty]
+                if not game_state.time_budgets:
+                    time_budget = None
+                if game_state.equity_samples:
+                    samples = game_state.equity_samples
+                equity = estimate_equity(hole, game_state.community_cards, opponents, samples, time_budget,
+                                         game_state.np_rng, game_state.board_mask)
+            fair_share = 1.0 / (opponents + 1)
+            to_call = current_bet - self.current_bet
+            call_odds = to_call / (pot + to_call) if to_call > 0 else 0
+
+        if self.difficulty == AIDifficulty.BEGINNER:
+            choice = rng.choices(["fold", "call", "raise"], weights=[0.2, 0.6, 0.2])[0]
+            raise_amount = rng.randint(10, 100)
+        elif self.difficulty == AIDifficulty.EASY:
+            choice = "raise" if strength > 0.5 else "call" if strength > 0.2 else "fold"
+            raise_amount = rng.randint(20, 80)
+        elif self.difficulty == AIDifficulty.MEDIUM:
+            choice = "raise" if equity > 2 * fair_share and pot_odds < 0.3 else "call" if equity >= call_odds else "fold"
+            raise_amount = 50 + rng.randint(0, int(equity * 100))
+        elif self.difficulty == AIDifficulty.HARD:
+            bluff_chance = 0.2 if early_round else 0.1
+            choice = rng.choices(["raise", "call", "fold"], weights=[0.4, 0.5, 0.1])[0] if rng.random() < bluff_chance else \
+                    "raise" if equity > 1.6 * fair_share else "call" if equity >= call_odds else "fold"
+            raise_amount = 100 + rng.randint(0, int(equity * 150))
+        else:  # Master
+            bluff_chance = 0.25 if early_round else 0.15
+            raise_edge = 1.4
+            call_margin = 0.0
+            if game_state.stats:
+                # Exploit what the table has shown: bluff players who fold to
+                # raises, value-raise loose tables thinner, call aggressors lighter
+                reads = [game_state.stats.read(p.name) for p in game_state.players if p is not self and not p.folded]
+                if reads:
+                    bluff_chance *= sum(r.fold_to_raise for r in reads) / len(reads) / DEFAULT_FOLD_TO_RAISE
+                    if sum(r.vpip for r in reads) / len(reads) > 0.5:
+                        raise_edge = 1.25
+                    if sum(r.aggression for r in reads) / len(reads) > 2.0:
+                        call_margin = 0.05
+            choice = rng.choices(["raise", "call", "fold"], weights=[0.5, 0.4, 0.1])[0] if rng.random() < bluff_chance else \
+                    "raise" if equity > raise_edge * fair_share and equity > call_odds + 0.1 else "call" if equity >= call_odds - call_margin else "fold"
+            raise_amount = 150 + rng.randint(0, int(equity * 200))
+        return choice, raise_amount
+
+    def apply_action(self, choice, raise_amount, current_bet):
+        if choice == "cant_call":
+            self.folded = True
+            return 0, "folded (can't call)"
+        if choice == "fold":
+            self.folded = True
+            return 0, "folded"
+        elif choice == "call":
+            amount = min(current_bet - self.current_bet, self.chips)
+            self.current_bet += amount
+            self.chips -= amount
+            return amount, f"called {amount}"
+        else:  # raise
+            amount = min(current_bet - self.current_bet + raise_amount, self.chips)
+            self.current_bet += amount
+            self.chips -= amount
+            return amount, f"raised to {self.current_bet}"
+
+# Game engine: deck, betting rounds and pot, no display
+class PokerEngine:
+    def __init__(self, players=None, seed=None):
+        self.rng = random.Random(seed)
+        self.np_rng = np.random.default_rng(seed)
+        self.deck = list(range(NUM_CARDS))  # Shuffled in place every hand
+        self.deck_top = NUM_CARDS
+        self.board_mask = 0
+        self.players = players if players is not None else [Player("You", 1000)]
+        self.difficulty = None
+        self.community_cards = []
+        self.pot = 0
+        self.current_bet = 0
+        self.phase = "waiting"
+        self.log = deque(maxlen=LOG_LINES)
+        self.current_turn = 0
+        self.current_player_index = 0
+        self.game_over = False
+        self.history = None  # Optional HandHistoryWriter
+        self.stats = None  # Optional OpponentModel, read by MASTER AIs
+        self.raised_this_round = False
+        self.time_budgets = False  # Cap AI equity estimates by wall-clock time
+        self.equity_samples = None  # Override every AI's equity sample count
+
+    def add_ai_players(self, difficulty, count, chips=1000):
+        self.difficulty = difficulty
+        self.players = [self.players[0]]
+        for j in range(count):
+            self.players.append(AIPlayer(f"AI{j+1} {difficulty.name.capitalize()}", difficulty, chips))
+
+    # Deal a new hand; replays pass the recorded deck order as card codes
+    def deal_cards(self, deck_codes=None):
+        if deck_codes is None:
+            self.reset_deck()
+        else:
+            self.deck[:] = deck_codes
+            self.deck_top = NUM_CARDS
+        if self.history:
+            self.history.record_hand(self.players, self.deck)
+        if self.stats:
+            self.stats.start_hand(self.players)
+        self.raised_this_round = False
+        for player in self.players:
+            player.hand = [self.draw_card(), self.draw_card()]
+            player.folded = False
+            player.current_bet = 0
+        self.community_cards = []
+        self.board_mask = 0
+        self.pot = 0
+        self.current_bet = 10  # Small blind
+        self.phase = "preflop"
+        self.log.clear()
+        self.current_turn = 0
+        self.current_player_index = 0
+
+    def reset_deck(self):
+        self.rng.shuffle(self.deck)
+        self.deck_top = NUM_CARDS
+
+    # Deal from the end of the shuffled deck without allocating
+    def draw_card(self):
+        self.deck_top -= 1
+        return self.deck[self.deck_top]
+
+    def deal_board(self, count):
+        for _ in range(count):
+            card = self.draw_card()
+            self.community_cards.append(card)
+            self.board_mask |= 1 << card
+
+    def handle_player_action(self, action, raise_amount=None):
+        player = self.players[0]
+        if action == "fold":
+            player.folded = True
+            amount = 0
+            self.log.append(f"Turn {self.current_turn}: You folded")
+        elif action == "call":
+            amount = min(self.current_bet - player.current_bet, player.chips)
+            player.current_bet += amount
+            player.chips -= amount
+            self.log.append(f"Turn {self.current_turn}: You called {amount}")
+        else:  # raise
+            amount = min(raise_amount - player.current_bet, player.chips)
+            player.current_bet += amount
+            player.chips -= amount
+            self.current_bet = player.current_bet
+            self.log.append(f"Turn {self.current_turn}: You raised to {player.current_bet}")
+        return amount
+
+    # Apply the human player's action and move the hand along
+    def submit_player_action(self, action, raise_amount=None):
+        if self.history:
+            self.history.record_action(0, action, raise_amount)
+        self.track_action(self.players[0], action)
+        self.pot += self.handle_player_action(action, raise_amount)
+        self.advance_player_turn()
+        if self.is_betting_round_over():
+            self.advance_phase()
+
+    def can_raise_to(self, raise_amount):
+        player = self.players[0]
+        return self.current_bet < raise_amount <= player.chips + player.current_bet
+
+    def is_human_turn(self):
+        player = self.players[0]
+        return (self.phase in BETTING_PHASES and self.current_player_index == 0
+                and not isinstance(player, AIPlayer) and not player.folded and player.chips > 0)
+
+    def is_ai_turn(self):
+        return (self.phase in BETTING_PHASES and len(self.players) > 1
+                and isinstance(self.players[self.current_player_index], AIPlayer))
+
+    # Let the AI whose turn it is act, then move the hand along. Returns True
+    # if the AI made a decision rather than being skipped.
+    def step_ai(self):
+        return self.finish_ai_turn(self.choose_ai_action())
+
+    # First half of an AI turn: the decision, or None if the AI is skipped.
+    # Reads the table but changes nothing, so front ends may run it in a worker.
+    def choose_ai_action(self):
+        current_player = self.players[self.current_player_index]
+        if current_player.folded or (current_player.chips == 0 and self.current_bet > current_player.current_bet):
+            return None
+        return current_player.choose_action(self, self.pot, self.current_bet)
+
+    # Second half of an AI turn: apply the decision and advance the hand
+    def finish_ai_turn(self, decision):
+        current_player = self.players[self.current_player_index]
+        if self.history:
+            self.history.record_action(self.current_player_index, *(decision or (None, 0)))
+        acted = False
+        if current_player.chips == 0 and self.current_bet > current_player.current_bet:
+            current_player.folded = True
+            self.log.append(f"Turn {self.current_turn}: {current_player.name} folded (out of chips)")
+        elif decision is not None:
+            self.track_action(current_player, "fold" if decision[0] == "cant_call" else decision[0])
+            self.current_turn += 1
+            amount, action_str = current_player.apply_action(*decision, self.current_bet)
+            self.pot += amount
+            self.current_bet = max(self.current_bet, current_player.current_bet)
+            self.log.append(f"Turn {self.current_turn}: {current_player.name} {action_str}")
+            acted = True
+        self.advance_player_turn()
+        if self.is_betting_round_over():
+            self.advance_phase()
+        return acted
+
+    # Feed one action to the opponent model before it is applied
+    def track_action(self, player, action):
+        if self.stats:
+            to_call = self.current_bet - player.current_bet
+            self.stats.record(player.name, action, self.phase == "preflop", to_call,
+                              self.raised_this_round and to_call > 0)
+        if action == "raise":
+            self.raised_this_round = True
+
+    def advance_player_turn(self):
+        self.current_player_index = (self.current_player_index + 1) % len(self.players)
+        while self.players[self.current_player_index].folded and len(self.get_active_players()) > 1:
+            self.current_player_index = (self.current_player_index + 1) % len(self.players)
+
+    def recent_log(self, count):
+        return list(self.log)[-count:]
+
+    def get_active_players(self):
+        return [p for p in self.players if not p.folded]
+
+    def is_betting_round_over(self):
+        active = self.get_active_players()
+        if len(active) <= 1:
+            return True
+        max_bet = max(p.current_bet for p in active)
+        return all(p.current_bet == max_bet or p.chips == 0 for p in active)
+
+    def advance_phase(self):
+        if self.phase == "preflop":
+            self.deal_board(3)
+            self.phase = "flop"
+        elif self.phase == "flop":
+            self.deal_board(1)
+            self.phase = "turn"
+        elif self.phase == "turn":
+            self.deal_board(1)
+            self.phase = "river"
+        elif self.phase == "river":
+            self.phase = "showdown"
+        self.current_bet = 0
+        self.raised_this_round = False
+        for player in self.players:
+            player.current_bet = 0
+
+    # Award the pot and check whether the game is over
+    def resolve_showdown(self):
+        active_players = self.get_active_players()
+        if len(active_players) <= 1:
+            winner = active_players[0] if active_players else self.players[0]
+            winner.chips += self.pot
+            self.log.append(f"{winner.name} won the pot (opponents folded)!")
+            winners = [winner]
+        else:
+            strengths = [p.evaluate_hand(self.community_cards) for p in active_players]
+            for p, strength in zip(active_players, strengths):
+                self.log.append(f"{p.name} hand: {CARD_NAMES[p.hand[0]]} {CARD_NAMES[p.hand[1]]} ({hand_name(strength)})")
+            max_strength = max(strengths)
+            winners = [active_players[k] for k in range(len(active_players)) if strengths[k] == max_strength]
+            split = self.pot // len(winners)
+            for winner in winners:
+                winner.chips += split
+            if len(winners) > 1:
+                self.log.append("Pot split among winners!")
+            else:
+                self.log.append(f"{winners[0].name} won the pot!")
+        if self.history:
+            self.history.record_showdown(self.players)
+        # Check for game over
+        if self.players[0].chips <= 0:
+            self.game_over = True
+            self.log.append("Game Over: You ran out of chips!")
+        elif all(p.chips <= 0 for p in self.players[1:]):
+            self.game_over = True
+            self.log.append("Game Over: All AIs ran out of chips! You win!")
+        return winners
+
+    # Play one full hand with AIs in every seat; returns the winners. Per core,
+    # table-free AIs manage about a million hands a minute; the equity AIs are
+    # bound by their postflop Monte Carlo, about 10k hands a minute heads-up for
+    # HARD and MASTER, or about 100k with equity_samples = BULK_EQUITY_SAMPLES.
+    def play_hand(self):
+        self.deal_cards()
+        while self.phase != "showdown":
+            if not self.is_ai_turn():
+                raise ValueError("play_hand needs an AIPlayer in every seat")
+            self.step_ai()
+        return self.resolve_showdown()
@@ -0,0 +1,309 @@
+import itertools
+import os
+import time
+
+import numpy as np
+
+# Hand evaluation tables for poker.py
+#
+# Cards are small ints: code = rank * 4 + suit, rank 0 (two) .. 12 (ace),
+# suit 0..3. Every hand of up to 7 cards maps to a hand value; higher values
+# beat lower ones and equal values split the pot.
+
+NUM_RANKS = 13
+NUM_SUITS = 4
+NUM_CARDS = 52
+
+HIGH_CARD, PAIR, TWO_PAIR, TRIPS, STRAIGHT, FLUSH, FULL_HOUSE, QUADS, STRAIGHT_FLUSH = range(9)
+CATEGORY_NAMES = ["High Card", "Pair", "Two Pair", "Three of a Kind", "Straight",
+                  "Flush", "Full House", "Four of a Kind", "Straight Flush"]
+
+# Per-card key: the low 32 bits hold the rank counts in base 5 (no rank can
+# appear more than 4 times), the high bits hold one 4-bit counter per suit.
+SUIT_SHIFT = 32
+RANK_KEY_MASK = (1 << SUIT_SHIFT) - 1
+FLUSH_PROBE = 0x3333  # adding 3 to a suit counter sets its top bit once it reaches 5
+FLUSH_BITS = 0x8888
+CARD_KEY = [5 ** (c >> 2) + (1 << (SUIT_SHIFT + 4 * (c & 3))) for c in range(NUM_CARDS)]
+RANK_BIT = [1 << (c >> 2) for c in range(NUM_CARDS)]
+_POW5 = [5 ** r for r in range(NUM_RANKS)]
+
+
+def card_code(rank, suit):
+    return rank * 4 + suit
+
+
+def card_rank(code):
+    return code >> 2
+
+
+def card_suit(code):
+    return code & 3
+
+
+# 64-bit set of cards, one bit per card code
+def cards_mask(cards):
+    mask = 0
+    for c in cards:
+        mask |= 1 << c
+    return mask
+
+
+# Helper to find the top rank of a straight in a 13-bit rank mask, or -1
+def _straight_top(mask):
+    # Shift up by one and put the ace under the deuce so the wheel is found too
+    wide = (mask << 1) | ((mask >> 12) & 1)
+    for top in range(13, 3, -1):
+        run = 0b11111 << (top - 4)
+        if wide & run == run:
+            return top - 1
+    return -1
+
+
+# Pack a category and up to five kickers (rank indexes, best first)
+def _pack(category, kickers):
+    value = category
+    for i in range(5):
+        value = (value << 4) | (kickers[i] + 1 if i < len(kickers) else 0)
+    return value
+
+
+def _ranks_desc(mask):
+    return [r for r in range(NUM_RANKS - 1, -1, -1) if mask >> r & 1]
+
+
+def _pack_flush(mask):
+    top = _straight_top(mask)
+    if top >= 0:
+        return _pack(STRAIGHT_FLUSH, [top])
+    return _pack(FLUSH, _ranks_desc(mask)[:5])
+
+
+def _pack_ranks(ranks):
+    # ranks is a sorted tuple of rank indexes, duplicates allowed
+    groups = sorted(((len(list(g)), r) for r, g in itertools.groupby(ranks)), reverse=True)
+    by_count = [r for _, r in groups]
+    distinct = sorted(by_count, reverse=True)
+    top_count = groups[0][0]
+    second_count = groups[1][0] if len(groups) > 1 else 0
+    if top_count == 4:
+        return _pack(QUADS, [by_count[0]] + [r for r in distinct if r != by_count[0]][:1])
+    if top_count == 3 and second_count >= 2:
+        return _pack(FULL_HOUSE, by_count[:2])
+    if len(distinct) >= 5:
+        mask = 0
+        for r in distinct:
+            mask |= 1 << r
+        straight = _straight_top(mask)
+        if straight >= 0:
+            return _pack(STRAIGHT, [straight])
+    if top_count == 3:
+        return _pack(TRIPS, by_count[:1] + [r for r in distinct if r != by_count[0]][:2])
+    if top_count == 2 and second_count == 2:
+        return _pack(TWO_PAIR, by_count[:2] + [r for r in distinct if r not in by_count[:2]][:1])
+    if top_count == 2:
+        return _pack(PAIR, by_count[:1] + [r for r in distinct if r != by_count[0]][:3])
+    return _pack(HIGH_CARD, distinct[:5])
+
+
+# Build the lookup tables. Packed values are replaced by their position in the
+# sorted list of distinct values, so hand values are small dense ints.
+def _build_tables():
+    rank_keys = []
+    rank_packed = []
+    for size in range(1, 8):
+        for ranks in itertools.combinations_with_replacement(range(NUM_RANKS), size):
+            if size > 4 and any(ranks[i] == ranks[i + 4] for i in range(size - 4)):
+                continue  # a rank can only appear four times
+            rank_keys.append(sum(_POW5[r] for r in ranks))
+            rank_packed.append(_pack_ranks(ranks))
+    flush_packed = [_pack_flush(mask) if bin(mask).count("1") >= 5 else 0 for mask in range(1 << NUM_RANKS)]
+
+    distinct = sorted(set(rank_packed).union(flush_packed))
+    distinct.remove(0)
+    index = {packed: i for i, packed in enumerate(distinct)}
+    flush_table = [index[p] if p else 0 for p in flush_packed]
+    order = sorted(range(len(rank_keys)), key=rank_keys.__getitem__)
+    sorted_keys = np.array([rank_keys[i] for i in order], dtype=np.int64)
+    sorted_values = np.array([index[rank_packed[i]] for i in order], dtype=np.int32)
+    rank_table = dict(zip(sorted_keys.tolist(), sorted_values.tolist()))
+    return rank_table, flush_table, sorted_keys, sorted_values, distinct
+
+
+_RANK_TABLE, _FLUSH_TABLE, _SORTED_KEYS, _SORTED_VALUES, _PACKED = _build_tables()
+NUM_HAND_VALUES = len(_PACKED)
+MAX_HAND_VALUE = NUM_HAND_VALUES - 1
+
+_CARD_KEY_ARRAY = np.array(CARD_KEY, dtype=np.int64)
+_FLUSH_TABLE_ARRAY = np.array(_FLUSH_TABLE, dtype=np.int32)
+# Rank bit of each card, split by suit (zero where the card has another suit)
+_SUIT_RANK_BITS = np.array([[RANK_BIT[c] if c & 3 == s else 0 for c in range(NUM_CARDS)]
+                            for s in range(NUM_SUITS)], dtype=np.int64)
+
+
+# Evaluate one hand of up to 7 card codes
+def evaluate(cards):
+    key = 0
+    for c in cards:
+        key += CARD_KEY[c]
+    flush = ((key >> SUIT_SHIFT) + FLUSH_PROBE) & FLUSH_BITS
+    if flush:
+        suit = (flush.bit_length() - 4) >> 2
+        mask = 0
+        for c in cards:
+            if c & 3 == suit:
+                mask |= RANK_BIT[c]
+        return _FLUSH_TABLE[mask]
+    return _RANK_TABLE[key & RANK_KEY_MASK]
+
+
+# Evaluate a batch of hands given as an (N, k) integer array of card codes
+def evaluate_batch(cards):
+    cards = np.asarray(cards, dtype=np.intp)
+    keys = _CARD_KEY_ARRAY[cards].sum(axis=1)
+    rank_keys = keys & RANK_KEY_MASK
+    values = _SORTED_VALUES[np.searchsorted(_SORTED_KEYS, rank_keys)]
+    suit_counts = keys >> SUIT_SHIFT
+    for suit in range(NUM_SUITS):
+        flush_rows = np.nonzero(((suit_counts >> (4 * suit)) & 0xF) >= 5)[0]
+        if len(flush_rows):
+            masks = _SUIT_RANK_BITS[suit][cards[flush_rows]].sum(axis=1)
+            values[flush_rows] = _FLUSH_TABLE_ARRAY[masks]
+    return values
+
+
+# Map a hand value to 0..1 for AI thresholds
+def hand_strength(value):
+    return value / MAX_HAND_VALUE
+
+
+def hand_category(value):
+    return _PACKED[value] >> 20
+
+
+def hand_name(value):
+    return CATEGORY_NAMES[hand_category(value)]
+
+
+
+# Monte Carlo equity
+EQUITY_BATCH = 512
+EQUITY_CACHE_SIZE = 4096
+_equity_cache = {}
+_equity_rng = np.random.default_rng()
+_ALL_CARDS = np.arange(NUM_CARDS, dtype=np.intp)
+
+
+def _equity_batch(hole, board, opponents, deck, size, rng):
+    # Deal the rest of the board and every opponent's hole cards in one go by
+    # taking the first few columns of a random permutation of the live deck
+    missing = 5 - len(board)
+    needed = missing + 2 * opponents
+    order = rng.random((size, len(deck))).argpartition(needed - 1, axis=1)[:, :needed]
+    dealt = deck[order]
+    boards = np.empty((size, 5), dtype=np.intp)
+    boards[:, :len(board)] = board
+    boards[:, len(board):] = dealt[:, :missing]
+    hero = evaluate_batch(np.hstack([np.broadcast_to(hole, (size, 2)), boards]))
+    best = np.full(size, -1, dtype=np.int32)
+    ties = np.zeros(size, dtype=np.int32)
+    for i in range(opponents):
+        start = missing + 2 * i
+        villain = evaluate_batch(np.hstack([dealt[:, start:start + 2], boards]))
+        ties = np.where(villain > best, 0, ties) + (villain == np.maximum(best, villain))
+        best = np.maximum(best, villain)
+    won = hero > best
+    tied = hero == best
+    return float(won.sum() + (tied / (ties + 1)).sum())
+
+
+# Forget cached equities, e.g. before a seeded simulation that must not see
+# results drawn from another run's random stream
+def clear_equity_cache():
+    _equity_cache.clear()
+
+
+# Estimate the share of the pot won against random opponent hands. Stops at
+# the sample budget or when time_budget seconds have passed, whichever is first.
+def estimate_equity(hole, board, opponents, samples=1000, time_budget=None, rng=None, board_mask=None):
+    hole_mask = cards_mask(hole)
+    board_mask = cards_mask(board) if board_mask is None else board_mask
+    key = (hole_mask, board_mask, opponents)
+    cached = _equity_cache.get(key)
+    if cached and cached[1] >= samples:
+        return cached[0]
+    rng = rng or _equity_rng
+    used = hole_mask | board_mask
+    deck = _ALL_CARDS[[not used >> c & 1 for c in range(NUM_CARDS)]]
+    hole = np.array(hole, dtype=np.intp)
+    board = np.array(board, dtype=np.intp)
+    deadline = time.perf_counter() + time_budget if time_budget else None
+    total = 0.0
+    done = 0
+    while done < samples:
+        size = min(EQUITY_BATCH, samples - done)
+        total += _equity_batch(hole, board, opponents, deck, size, rng)
+        done += size
+        if deadline and time.perf_counter() >= deadline:
+            break
+    equity = total / done
+    if len(_equity_cache) >= EQUITY_CACHE_SIZE:
+        _equity_cache.clear()
+    _equity_cache[key] = (equity, done)
+    return equity
+
+
+# Preflop equity table: all-in equity of the 169 starting-hand classes against
+# 1..PREFLOP_MAX_OPPONENTS random hands, built by poker_preflop.py and
+# memory-mapped here so nothing is simulated at startup.
+PREFLOP_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "preflop_equity.bin")
+PREFLOP_MAGIC = b"PFEQ"
+PREFLOP_VERSION = 1
+PREFLOP_HEADER_SIZE = 16
+PREFLOP_CLASSES = NUM_RANKS * NUM_RANKS
+PREFLOP_MAX_OPPONENTS = 5
+PREFLOP_SCALE = 65535  # equities are stored as little-endian uint16 fractions
+
+
+# Starting-hand class on a 13x13 grid: pairs on the diagonal, suited hands
+# above it (high rank row) and offsuit hands below it (low rank row)
+def preflop_class(hole):
+    a, b = hole
+    high, low = max(a >> 2, b >> 2), min(a >> 2, b >> 2)
+    if a & 3 == b & 3:
+        return high * NUM_RANKS + low
+    return low * NUM_RANKS + high
+
+
+# One concrete hand for each class, used when building the table
+def preflop_class_hand(index):
+    row, col = divmod(index, NUM_RANKS)
+    if row > col:
+        return [card_code(row, 0), card_code(col, 0)]
+    return [card_code(col, 0), card_code(row, 1)]
+
+
+def preflop_header():
+    return (PREFLOP_MAGIC + PREFLOP_VERSION.to_bytes(4, "little") + PREFLOP_CLASSES.to_bytes(2, "little")
+            + PREFLOP_MAX_OPPONENTS.to_bytes(2, "little")).ljust(PREFLOP_HEADER_SIZE, b"\0")
+
+
+def load_preflop_table(path=PREFLOP_TABLE_PATH):
+    try:
+        with open(path, "rb") as f:
+            if f.read(PREFLOP_HEADER_SIZE) != preflop_header():
+                return None
+        return np.memmap(path, dtype="<u2", mode="r", offset=PREFLOP_HEADER_SIZE,
+                         shape=(PREFLOP_CLASSES, PREFLOP_MAX_OPPONENTS))
+    except (OSError, ValueError):
+        return None
+
+
+_preflop_table = load_preflop_table()
+
+
+# Table lookup, or None when the table is missing or doesn't cover the spot
+def preflop_equity(hole, opponents):
+    if _preflop_table is None or not 1 <= opponents <= PREFLOP_MAX_OPPONENTS:
+        return None
+    return _preflop_table[preflop_class(hole), opponents - 1] / PREFLOP_SCALE
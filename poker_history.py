@@ -0,0 +1,170 @@
+import argparse
+import platform
+import queue
+import struct
+import threading
+
+from poker_engine import AIDifficulty, AIPlayer, Player, PokerEngine
+
+# Append-only hand history for poker.py, one small binary record per event:
+#
+#   hand      kind, seat count, the 52-card deck in shuffled order, then
+#             (chips, difficulty) per seat; difficulty 0 is the human seat
+#   action    kind, seat, action code, raise amount
+#   showdown  kind, seat count, then chips per seat after the pot is paid
+#
+# Records are packed on the game thread and written by a background thread.
+# Any hand can be re-simulated from the file:
+#
+#   python poker_history.py poker_history.bin            (list hands)
+#   python poker_history.py poker_history.bin --hand 12  (replay one)
+
+HISTORY_PATH = "poker_history.bin"
+
+HAND, ACTION, SHOWDOWN = range(3)
+ACTIONS = [None, "fold", "call", "raise", "cant_call"]
+ACTION_CODES = {action: code for code, action in enumerate(ACTIONS)}
+
+HEADER = struct.Struct("<BB")
+ACTION_RECORD = struct.Struct("<BBBi")
+SEAT = struct.Struct("<iB")
+CHIPS = struct.Struct("<i")
+DECK_SIZE = 52
+
+
+# Background writer the engine reports to through its history attribute
+class HandHistoryWriter:
+    def __init__(self, path=HISTORY_PATH):
+        self.file = open(path, "ab")
+        self.queue = queue.SimpleQueue()
+        # Browsers have no threads, so records are written inline there
+        self.thread = None
+        if platform.system() != "Emscripten":
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+    def record_hand(self, players, deck_codes):
+        data = [HEADER.pack(HAND, len(players)), bytes(deck_codes)]
+        for player in players:
+            data.append(SEAT.pack(player.chips, player.difficulty.value if isinstance(player, AIPlayer) else 0))
+        self._write(b"".join(data))
+
+    def record_action(self, seat, action, raise_amount):
+        self._write(ACTION_RECORD.pack(ACTION, seat, ACTION_CODES[action], raise_amount or 0))
+
+    def record_showdown(self, players):
+        self._write(HEADER.pack(SHOWDOWN, len(players)) + b"".join(CHIPS.pack(p.chips) for p in players))
+
+    def _write(self, data):
+        if self.thread is None:
+            self.file.write(data)
+            self.file.flush()
+        else:
+            self.queue.put(data)
+
+    def _run(self):
+        while True:
+            chunks = [self.queue.get()]
+            # Drain whatever else is waiting so bursts become one write
+            while not self.queue.empty():
+                chunks.append(self.queue.get())
+            done = chunks[-1] is None
+            self.file.write(b"".join(c for c in chunks if c is not None))
+            self.file.flush()
+            if done:
+                return
+
+    def close(self):
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+        self.file.close()
+
+
+# Split a history file into hands: (seats, deck, actions, final chips or None).
+# A record cut short by a crash ends the read, and a trailing hand that never
+# reached its showdown record is dropped.
+def read_hands(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    hands = []
+    pos = 0
+    while pos + HEADER.size <= len(data):
+        kind, count = HEADER.unpack_from(data, pos)
+        if kind == HAND:
+            size = HEADER.size + DECK_SIZE + count * SEAT.size
+        elif kind == ACTION:
+            size = ACTION_RECORD.size
+        else:
+            size = HEADER.size + count * CHIPS.size
+        if pos + size > len(data):
+            break
+        if kind == HAND:
+            pos += HEADER.size
+            deck = list(data[pos:pos + DECK_SIZE])
+            pos += DECK_SIZE
+            seats = [SEAT.unpack_from(data, pos + i * SEAT.size) for i in range(count)]
+            pos += count * SEAT.size
+            hands.append((seats, deck, [], None))
+        elif kind == ACTION:
+            _, seat, code, raise_amount = ACTION_RECORD.unpack_from(data, pos)
+            pos += ACTION_RECORD.size
+            hands[-1][2].append((seat, ACTIONS[code], raise_amount))
+        else:
+            pos += HEADER.size
+            chips = [CHIPS.unpack_from(data, pos + i * CHIPS.size)[0] for i in range(count)]
+            pos += count * CHIPS.size
+            hands[-1] = hands[-1][:3] + (chips,)
+    if hands and hands[-1][3] is None:
+        hands.pop()
+    return hands
+
+
+# Re-run one recorded hand through the engine; returns the engine afterwards
+def replay_hand(hand):
+    seats, deck, actions, _ = hand
+    players = []
+    for i, (chips, difficulty) in enumerate(seats):
+        if difficulty:
+            difficulty = AIDifficulty(difficulty)
+            players.append(AIPlayer(f"AI{i} {difficulty.name.capitalize()}", difficulty, chips))
+        else:
+            players.append(Player("You", chips))
+    engine = PokerEngine(players)
+    engine.deal_cards(deck)
+    for seat, action, raise_amount in actions:
+        if engine.current_player_index != seat:
+            raise ValueError(f"history has seat {seat} acting on seat {engine.current_player_index}'s turn")
+        if isinstance(players[seat], AIPlayer):
+            engine.finish_ai_turn(None if action is None else (action, raise_amount))
+        else:
+            engine.submit_player_action(action, raise_amount)
+    if engine.phase == "showdown":
+        engine.resolve_showdown()
+    return engine
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List or replay hands from a poker.py hand history.")
+    parser.add_argument("path", nargs="?", default=HISTORY_PATH)
+    parser.add_argument("--hand", type=int, help="replay this hand (0-based); lists all hands if omitted")
+    args = parser.parse_args()
+
+    hands = read_hands(args.path)
+    if args.hand is None:
+        for i, (seats, _, actions, chips) in enumerate(hands):
+            result = "unfinished" if chips is None else " ".join(str(c) for c in chips)
+            print(f"{i:6d}  {len(seats)} seats  {len(actions):3d} actions  chips after: {result}")
+        return
+    hand = hands[args.hand]
+    engine = replay_hand(hand)
+    for line in engine.log:
+        print(line)
+    if hand[3] is not None:
+        replayed = [p.chips for p in engine.players]
+        print("Replay matches recorded chips." if replayed == hand[3] else
+              f"Replay diverged: recorded {hand[3]}, replayed {replayed}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import argparse
+import multiprocessing
+import time
+
+import numpy as np
+from poker_eval import (PREFLOP_CLASSES, PREFLOP_MAX_OPPONENTS, PREFLOP_SCALE, PREFLOP_TABLE_PATH,
+                        estimate_equity, preflop_class_hand, preflop_header)
+
+# Builds the preflop equity table that poker_eval.py memory-maps at startup:
+#
+#   python poker_preflop.py --samples 200000
+
+
+def class_equities(task):
+    index, samples, seed = task
+    rng = np.random.default_rng([seed, index])
+    hole = preflop_class_hand(index)
+    return index, [estimate_equity(hole, [], opponents, samples, rng=rng)
+                   for opponents in range(1, PREFLOP_MAX_OPPONENTS + 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the preflop equity table for poker.py.")
+    parser.add_argument("--samples", type=int, default=100000, help="Monte Carlo samples per class and opponent count")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--output", default=PREFLOP_TABLE_PATH)
+    args = parser.parse_args()
+
+    table = np.zeros((PREFLOP_CLASSES, PREFLOP_MAX_OPPONENTS), dtype="<u2")
+    start = time.perf_counter()
+    tasks = [(index, args.samples, args.seed) for index in range(PREFLOP_CLASSES)]
+    with multiprocessing.Pool(args.processes) as pool:
+        for done, (index, equities) in enumerate(pool.imap_unordered(class_equities, tasks), 1):
+            table[index] = np.round(np.array(equities) * PREFLOP_SCALE)
+            print(f"\r{done}/{PREFLOP_CLASSES} classes", end="", flush=True)
+    with open(args.output, "wb") as f:
+        f.write(preflop_header())
+        f.write(table.tobytes())
+    print(f"\nWrote {args.output} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import os
+import struct
+
+# Running opponent statistics for MASTER AIs, keyed by player name. Counters
+# are bumped once per action and the ratios are recomputed on the spot, so
+# decisions read plain attributes and never rescan a history.
+
+STATS_PATH = "poker_opponents.bin"
+MIN_HANDS = 20  # Below this the table defaults are used instead of a player's numbers
+
+# Neutral reads for players we know nothing about yet
+DEFAULT_VPIP = 0.35
+DEFAULT_PFR = 0.15
+DEFAULT_AGGRESSION = 1.0
+DEFAULT_FOLD_TO_RAISE = 0.4
+
+COUNTERS = struct.Struct("<7I")
+NAME_LENGTH = struct.Struct("<B")
+
+
+class OpponentStats:
+    def __init__(self, counters=(0, 0, 0, 0, 0, 0, 0)):
+        (self.hands, self.vpip_hands, self.pfr_hands, self.aggressive, self.calls,
+         self.faced_raise, self.folded_to_raise) = counters
+        self.vpip_this_hand = False
+        self.pfr_this_hand = False
+        self.refresh()
+
+    def counters(self):
+        return (self.hands, self.vpip_hands, self.pfr_hands, self.aggressive, self.calls,
+                self.faced_raise, self.folded_to_raise)
+
+    # Recompute the cached ratios after a counter changes
+    def refresh(self):
+        known = self.hands >= MIN_HANDS
+        self.vpip = self.vpip_hands / self.hands if known else DEFAULT_VPIP
+        self.pfr = self.pfr_hands / self.hands if known else DEFAULT_PFR
+        self.aggression = self.aggressive / max(1, self.calls) if known else DEFAULT_AGGRESSION
+        self.fold_to_raise = (self.folded_to_raise / self.faced_raise
+                              if known and self.faced_raise else DEFAULT_FOLD_TO_RAISE)
+
+
+UNKNOWN = OpponentStats()
+
+
+class OpponentModel:
+    def __init__(self):
+        self.players = {}
+
+    # Read-only lookup for decisions; unknown players get the defaults
+    def read(self, name):
+        return self.players.get(name, UNKNOWN)
+
+    def get(self, name):
+        stats = self.players.get(name)
+        if stats is None:
+            stats = self.players[name] = OpponentStats()
+        return stats
+
+    def start_hand(self, players):
+        for player in players:
+            stats = self.get(player.name)
+            stats.hands += 1
+            stats.vpip_this_hand = stats.pfr_this_hand = False
+            stats.refresh()
+
+    # One action: action is "fold", "call" or "raise"; to_call is what the
+    # player owed before acting
+    def record(self, name, action, preflop, to_call, facing_raise):
+        stats = self.get(name)
+        if facing_raise:
+            stats.faced_raise += 1
+            if action == "fold":
+                stats.folded_to_raise += 1
+        if action == "raise":
+            stats.aggressive += 1
+        elif action == "call" and to_call > 0:
+            stats.calls += 1
+        if preflop and not stats.vpip_this_hand and (action == "raise" or (action == "call" and to_call > 0)):
+            stats.vpip_this_hand = True
+            stats.vpip_hands += 1
+        if preflop and action == "raise" and not stats.pfr_this_hand:
+            stats.pfr_this_hand = True
+            stats.pfr_hands += 1
+        stats.refresh()
+
+    # Each record: name length, UTF-8 name, seven uint32 counters
+    def save(self, path=STATS_PATH):
+        data = []
+        for name, stats in self.players.items():
+            encoded = name.encode("utf-8")[:255]
+            data.append(NAME_LENGTH.pack(len(encoded)) + encoded + COUNTERS.pack(*stats.counters()))
+        with open(path + ".tmp", "wb") as f:
+            f.write(b"".join(data))
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, path=STATS_PATH):
+        model = cls()
+        if not os.path.exists(path):
+            return model
+        with open(path, "rb") as f:
+            data = f.read()
+        pos = 0
+        while pos < len(data):
+            (length,) = NAME_LENGTH.unpack_from(data, pos)
+            pos += NAME_LENGTH.size
+            name = data[pos:pos + length].decode("utf-8")
+            pos += length
+            model.players[name] = OpponentStats(COUNTERS.unpack_from(data, pos))
+            pos += COUNTERS.size
+        return model
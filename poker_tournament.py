@@ -0,0 +1,158 @@
+import argparse
+import itertools
+import json
+import math
+import multiprocessing
+import time
+
+from poker_eval import clear_equity_cache
+from poker_engine import BULK_EQUITY_SAMPLES, AIDifficulty, AIPlayer, PokerEngine
+from poker_stats import OpponentModel
+
+# Headless tournament: every AIDifficulty plays seeded heads-up matches against
+# every other across a process pool, and the results are rolled up into a
+# report with chip curves, win rates and confidence intervals.
+#
+#   python poker_tournament.py --matches 200 --hands 300 --processes 8
+
+STARTING_CHIPS = 1000
+CURVE_POINTS = 20
+Z_95 = 1.96
+
+
+# Play one match and return its result; runs inside a worker process
+def play_match(task):
+    name_a, name_b, seed, max_hands, equity_samples = task
+    clear_equity_cache()
+    player_a = AIPlayer("A", AIDifficulty[name_a], STARTING_CHIPS)
+    player_b = AIPlayer("B", AIDifficulty[name_b], STARTING_CHIPS)
+    # Swap seats on odd seeds so neither side always acts first
+    seats = [player_a, player_b] if seed % 2 == 0 else [player_b, player_a]
+    engine = PokerEngine(seats, seed=seed)
+    engine.time_budgets = False  # Sample counts only, so a seed replays the same match anywhere
+    engine.equity_samples = equity_samples
+    engine.stats = OpponentModel()  # Fresh per match so MASTER adapts within it
+    curve = [player_a.chips]
+    hands = 0
+    while hands < max_hands and player_a.chips > 0 and player_b.chips > 0:
+        engine.play_hand()
+        hands += 1
+        curve.append(player_a.chips)
+    curve.extend([player_a.chips] * (max_hands + 1 - len(curve)))
+    step = max(1, max_hands // CURVE_POINTS)
+    return {
+        "pairing": (name_a, name_b),
+        "seed": seed,
+        "hands": hands,
+        "delta": player_a.chips - STARTING_CHIPS,
+        "winner": "A" if player_a.chips > player_b.chips else "B" if player_b.chips > player_a.chips else None,
+        "curve": curve[::step],
+    }
+
+
+def wilson_interval(wins, n):
+    if n == 0:
+        return 0.0, 0.0
+    p = wins / n
+    centre = (p + Z_95 ** 2 / (2 * n)) / (1 + Z_95 ** 2 / n)
+    half = Z_95 * math.sqrt(p * (1 - p) / n + Z_95 ** 2 / (4 * n * n)) / (1 + Z_95 ** 2 / n)
+    return centre - half, centre + half
+
+
+def mean_interval(values):
+    n = len(values)
+    mean = sum(values) / n
+    if n < 2:
+        return mean, mean, mean
+    sd = math.sqrt(sum((v - mean) ** 2 for v in values) / (n - 1))
+    half = Z_95 * sd / math.sqrt(n)
+    return mean, mean - half, mean + half
+
+
+# Roll match results up per pairing and per difficulty
+def build_report(results, max_hands):
+    pairings = {}
+    for result in results:
+        pairings.setdefault(result["pairing"], []).append(result)
+    report = {"pairings": [], "difficulties": {}}
+    totals = {d.name: [0, 0] for d in AIDifficulty}  # [match wins, matches]
+    order = sorted(pairings, key=lambda pair: (AIDifficulty[pair[0]].value, AIDifficulty[pair[1]].value))
+    for name_a, name_b in order:
+        matches = pairings[name_a, name_b]
+        n = len(matches)
+        wins_a = sum(1 for m in matches if m["winner"] == "A")
+        wins_b = sum(1 for m in matches if m["winner"] == "B")
+        per_hand = [m["delta"] / max(1, m["hands"]) for m in matches]
+        mean, low, high = mean_interval(per_hand)
+        win_low, win_high = wilson_interval(wins_a, n)
+        curve = [sum(point) / n for point in zip(*(m["curve"] for m in matches))]
+        report["pairings"].append({
+            "a": name_a,
+            "b": name_b,
+            "matches": n,
+            "a_wins": wins_a,
+            "b_wins": wins_b,
+            "a_win_rate": wins_a / n,
+            "a_win_rate_ci": [win_low, win_high],
+            "a_chips_per_hand": mean,
+            "a_chips_per_hand_ci": [low, high],
+            "avg_hands": sum(m["hands"] for m in matches) / n,
+            "a_chip_curve": curve,
+            "curve_step": max(1, max_hands // CURVE_POINTS),
+        })
+        totals[name_a][0] += wins_a
+        totals[name_a][1] += n
+        totals[name_b][0] += wins_b
+        totals[name_b][1] += n
+    for name, (wins, n) in totals.items():
+        low, high = wilson_interval(wins, n)
+        report["difficulties"][name] = {"match_wins": wins, "matches": n,
+                                        "win_rate": wins / n if n else 0.0, "win_rate_ci": [low, high]}
+    return report
+
+
+def print_report(report, elapsed, total_hands):
+    print(f"{total_hands} hands in {elapsed:.1f}s ({total_hands / max(elapsed, 1e-9):.0f} hands/s)\n")
+    print(f"{'A':<9}{'B':<9}{'matches':>8}{'A win %':>10}{'95% CI':>16}{'A chips/hand':>14}{'95% CI':>20}")
+    for p in report["pairings"]:
+        ci = p["a_win_rate_ci"]
+        chip_ci = p["a_chips_per_hand_ci"]
+        print(f"{p['a']:<9}{p['b']:<9}{p['matches']:>8}{100 * p['a_win_rate']:>9.1f}%"
+              f"{f'[{100 * ci[0]:.1f}, {100 * ci[1]:.1f}]':>16}{p['a_chips_per_hand']:>14.2f}"
+              f"{f'[{chip_ci[0]:.2f}, {chip_ci[1]:.2f}]':>20}")
+    print(f"\n{'Difficulty':<12}{'matches':>8}{'win %':>9}{'95% CI':>16}")
+    for name, d in report["difficulties"].items():
+        ci = d["win_rate_ci"]
+        print(f"{name:<12}{d['matches']:>8}{100 * d['win_rate']:>8.1f}%{f'[{100 * ci[0]:.1f}, {100 * ci[1]:.1f}]':>16}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run seeded AI-vs-AI poker tournaments across all cores.")
+    parser.add_argument("--matches", type=int, default=50, help="matches per pairing")
+    parser.add_argument("--hands", type=int, default=200, help="maximum hands per match")
+    parser.add_argument("--seed", type=int, default=0, help="base seed; match i of a pairing uses seed + i")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--difficulties", nargs="+", default=[d.name for d in AIDifficulty],
+                        choices=[d.name for d in AIDifficulty], help="difficulties to include")
+    parser.add_argument("--equity-samples", type=int, default=None,
+                        help=f"one equity sample count for every AI, e.g. {BULK_EQUITY_SAMPLES} for quick sweeps (default: per difficulty)")
+    parser.add_argument("--json", help="also write the full report, chip curves included, to this file")
+    args = parser.parse_args()
+
+    tasks = [(a, b, args.seed + i, args.hands, args.equity_samples)
+             for a, b in itertools.combinations(args.difficulties, 2)
+             for i in range(args.matches)]
+    start = time.perf_counter()
+    with multiprocessing.Pool(args.processes) as pool:
+        results = list(pool.imap_unordered(play_match, tasks, chunksize=4))
+    elapsed = time.perf_counter() - start
+
+    report = build_report(results, args.hands)
+    print_report(report, elapsed, sum(r["hands"] for r in results))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
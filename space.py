@@ -2,14 +2,15 @@ import asyncio
 import platform
 import pygame
 import math
-import random
+from spacewar_core import FPS, MAX_STEPS, STEP, SPACE_RULES, Controls, Match
 
 # Initialize Pygame
 pygame.init()
 
 # Screen settings
-WIDTH = 800
-HEIGHT = 600
+RULES = SPACE_RULES
+WIDTH = RULES.width
+HEIGHT = RULES.height
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption("Spacewar!")
 
@@ -47,230 +48,37 @@ konami_code = [
 ]
 konami_index = 0
 
-# Ship class
-class Ship:
-    def __init__(self, x, y, color, angle=0):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.angle = angle
-        self.speed_x = 0
-        self.speed_y = 0
-        self.size = 20
-        self.shoot_cooldown = 0
-        self.alive = True
-
-    def rotate(self, direction):
-        self.angle += direction * 5
-
-    def move(self):
-        self.speed_x += math.cos(math.radians(self.angle)) * 0.02
-        self.speed_y -= math.sin(math.radians(self.angle)) * 0.02
-        self.x += self.speed_x
-        self.y += self.speed_y
-        self.x = self.x % WIDTH
-        self.y = self.y % HEIGHT
-
-    def draw(self, screen):
-        if self.alive:
-            points = [
-                (self.x + self.size * math.cos(math.radians(self.angle)),
-                 self.y - self.size * math.sin(math.radians(self.angle))),
-                (self.x + self.size * math.cos(math.radians(self.angle + 135)),
-                 self.y - self.size * math.sin(math.radians(self.angle + 135))),
-                (self.x + self.size * math.cos(math.radians(self.angle - 135)),
-                 self.y - self.size * math.sin(math.radians(self.angle - 135)))
-            ]
-            pygame.draw.polygon(screen, self.color, points)
-
-    def shoot(self, bullets):
-        if self.shoot_cooldown <= 0 and self.alive:
-            bullets.append(Bullet(self.x, self.y, self.angle, self.color))
-            self.shoot_cooldown = 20
-
-# Bullet class
-class Bullet:
-     def __init__(self, x, y, angle, color, speed=5, life=60, size=2):
-         self.x = x
-         self.y = y
-         self.speed = speed
-         self.angle = angle
-         self.color = color
-         self.life = life
-         self.size = size
-
-     def move(self):
-         self.x += math.cos(math.radians(self.angle)) * self.speed
-         self.y -= math.sin(math.radians(self.angle)) * self.speed
-         self.life -= 1
-         self.x = self.x % WIDTH
-         self.y = self.y % HEIGHT
-
-     def draw(self, screen):
-         pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.size)
-
-# Asteroid class
-class Asteroid:
-    def __init__(self):
-        self.x = random.randint(0, WIDTH)
-        self.y = random.randint(0, HEIGHT)
-        self.size = 10
-        self.speed_x = random.uniform(-0.5, 0.5)
-        self.speed_y = random.uniform(-0.5, 0.5)
-
-    def move(self):
-        self.x += self.speed_x
-        self.y += self.speed_y
-        self.x = self.x % WIDTH
-        self.y = self.y % HEIGHT
-
-    def draw(self, screen):
-        pygame.draw.circle(screen, GRAY, (int(self.x), int(self.y)), self.size)
-
-def ai_control(player, opponent, bullets, asteroids, difficulty):
-    if not opponent.alive:
-        return
-
-    # Calculate angle to player
-    dx = player.x - opponent.x
-    dy = player.y - opponent.y
-    angle_to_player = math.degrees(math.atan2(-dy, dx)) % 360
-
-    # Difficulty-based parameters (inspired by references, but adjusted per user request)
-    if difficulty == 'easy':
-        rotation_speed = 2
-        shoot_chance = 0.01
-        move_chance = 0.05
-        accuracy = 40
-        speed_boost = 0.01  # Slower thrust for Easy
-        special_chance = 0.0
-    elif difficulty == 'hard':
-        rotation_speed = 5
-        shoot_chance = 0.05
-        move_chance = 0.3
-        accuracy = 20
-        speed_boost = 0.02  # Standard thrust
-        special_chance = 0.01  # Small chance for specials
-    elif difficulty == 'master':
-        rotation_speed = 8
-        shoot_chance = 0.15
-        move_chance = 0.6
-        accuracy = 8
-        speed_boost = 0.02  # Standard thrust
-        special_chance = 0.05  # Medium chance for specials
-    else:  # ultra_master
-        rotation_speed = 12
-        shoot_chance = 0.3
-        move_chance = 0.9
-        accuracy = 3
-        speed_boost = 0.02  # Standard thrust
-        special_chance = 0.05  # Medium chance for specials
-
-    # Rotate towards player
-    angle_diff = (angle_to_player - opponent.angle) % 360
-    if angle_diff > 180:
-        angle_diff -= 360
-    if abs(angle_diff) > accuracy:
-        opponent.rotate(1 if angle_diff > 0 else -1)
-
-    # Move with standardized thrust
-    if random.random() < move_chance:
-        opponent.speed_x += math.cos(math.radians(opponent.angle)) * speed_boost
-        opponent.speed_y -= math.sin(math.radians(opponent.angle)) * speed_boost
-        opponent.x += opponent.speed_x
-        opponent.y += opponent.speed_y
-        opponent.x = opponent.x % WIDTH
-        opponent.y = opponent.y % HEIGHT
-
-    # Regular shoot when aligned
-    if random.random() < shoot_chance and abs(angle_diff) < accuracy:
-        opponent.shoot(bullets)
-
-    # Special attacks (only for Hard and above)
-    if random.random() < special_chance:
-        if difficulty == 'hard':
-            choice = random.choice(['rapid', 'big'])
-            if choice == 'rapid':
-                # Rapid-fire: 3 bullets with slight angle variance
-                for _ in range(3):
-                    var_angle = opponent.angle + random.uniform(-5, 5)
-                    bullets.append(Bullet(opponent.x, opponent.y, var_angle, opponent.color))
-            elif choice == 'big':
-                # Big bullet: Slower, larger size
-                bullets.append(Bullet(opponent.x, opponent.y, opponent.angle, opponent.color, speed=3, size=5))
-        elif difficulty == 'master':
-            choice = random.choice(['ultrarapid', 'asteroid'])
-            if choice == 'ultrarapid':
-                # Ultra-rapid-fire: 10 bullets with wider variance
-                for _ in range(10):
-                    var_angle = opponent.angle + random.uniform(-10, 10)
-                    bullets.append(Bullet(opponent.x, opponent.y, var_angle, opponent.color))
-            elif choice == 'asteroid':
-                # Shoot one asteroid towards player
-                dist = math.hypot(dx, dy)
-                if dist > 0:
-                    dir_x = dx / dist
-                    dir_y = dy / dist
-                    ast = Asteroid()
-                    ast.x = opponent.x
-                    ast.y = opponent.y
-                    ast.speed_x = dir_x * 2
-                    ast.speed_y = dir_y * 2
-                    asteroids.append(ast)
-        elif difficulty == 'ultra_master':
-            choice = random.choice(['two_asteroids', 'sparks', 'laser'])
-            if choice == 'two_asteroids':
-                # Shoot two asteroids towards player with slight variance
-                dist = math.hypot(dx, dy)
-                if dist > 0:
-                    dir_x = dx / dist
-                    dir_y = dy / dist
-                    for _ in range(2):
-                        ast = Asteroid()
-                        ast.x = opponent.x
-                        ast.y = opponent.y
-                        ast.speed_x = (dir_x + random.uniform(-0.2, 0.2)) * 2
-                        ast.speed_y = (dir_y + random.uniform(-0.2, 0.2)) * 2
-                        asteroids.append(ast)
-            elif choice == 'sparks':
-                # Fire blue sparks all over the arena (20 small random bullets)
-                for _ in range(20):
-                    rand_angle = random.uniform(0, 360)
-                    bullets.append(Bullet(opponent.x, opponent.y, rand_angle, BLUE, speed=3, life=30, size=1))
-            elif choice == 'laser':
-                # Red laser crackling bolt: Fast, medium size, red color
-                bullets.append(Bullet(opponent.x, opponent.y, opponent.angle, RED, speed=10, life=40, size=4))
-
-    # Avoid asteroids
-    for asteroid in asteroids:
-        dist = math.hypot(asteroid.x - opponent.x, asteroid.y - opponent.y)
-        if dist < 50:
-            angle_to_asteroid = math.degrees(math.atan2(-(asteroid.y - opponent.y), asteroid.x - opponent.x)) % 360
-            angle_diff = (angle_to_asteroid - opponent.angle) % 360
-            if angle_diff > 180:
-                angle_diff -= 360
-            avoidance_chance = 0.5 if difficulty == 'easy' else 0.8 if difficulty == 'hard' else 0.95 if difficulty == 'master' else 1.0
-            if random.random() < avoidance_chance:
-                opponent.rotate(-1 if angle_diff > 0 else 1)
-
-    # Move more frequently
-    if random.random() < move_chance:
-        opponent.move()
-
-    # Shoot when aligned
-    if random.random() < shoot_chance and abs(angle_diff) < accuracy:
-        opponent.shoot(bullets)
-
-    # Avoid asteroids
-    for asteroid in asteroids:
-        dist = math.hypot(asteroid.x - opponent.x, asteroid.y - opponent.y)
-        if dist < 50:
-            angle_to_asteroid = math.degrees(math.atan2(-(asteroid.y - opponent.y), asteroid.x - opponent.x)) % 360
-            angle_diff = (angle_to_asteroid - opponent.angle) % 360
-            if angle_diff > 180:
-                angle_diff -= 360
-            if difficulty in ['hard', 'master', 'ultra_master'] or random.random() < 0.5:
-                opponent.rotate(-1 if angle_diff > 0 else 1)
+# Drawing; the ships, bullets and asteroids themselves live in spacewar_core
+def draw_ship(screen, ship):
+    if ship.alive:
+        points = [
+            (ship.x + ship.size * math.cos(math.radians(ship.angle)),
+             ship.y - ship.size * math.sin(math.radians(ship.angle))),
+            (ship.x + ship.size * math.cos(math.radians(ship.angle + 135)),
+             ship.y - ship.size * math.sin(math.radians(ship.angle + 135))),
+            (ship.x + ship.size * math.cos(math.radians(ship.angle - 135)),
+             ship.y - ship.size * math.sin(math.radians(ship.angle - 135)))
+        ]
+        pygame.draw.polygon(screen, ship.color, points)
+
+def draw_bullet(screen, x, y, size, color):
+    pygame.draw.circle(screen, color, (int(x), int(y)), int(size))
+
+# Asteroids are stamped from one pre-drawn sprite per size, so big fields draw in a single blits call
+asteroid_sprites = {}
+
+def draw_asteroids(screen, asteroids):
+    stamps = []
+    for x, y, size in asteroids.items():
+        size = int(size)
+        sprite = asteroid_sprites.get(size)
+        if sprite is None:
+            sprite = pygame.Surface((2 * size + 1, 2 * size + 1))
+            sprite.set_colorkey(BLACK)
+            pygame.draw.circle(sprite, GRAY, (size, size), size)
+            asteroid_sprites[size] = sprite
+        stamps.append((sprite, (int(x) - size, int(y) - size)))
+    screen.blits(stamps, False)
 
 # Button class
 class Button:
@@ -289,12 +97,9 @@ class Button:
         return self.rect.collidepoint(pos)
 
 # Game setup
-player1 = None
-player2 = None
-bullets = []
-asteroids = []
+match = None
+accumulator = 0.0  # Real time not yet simulated, in seconds
 clock = pygame.time.Clock()
-FPS = 60
 
 # Menu buttons
 pvp_button = Button("PvP Mode", WIDTH//2 - 100, HEIGHT//2 - 50, 200, 50)
@@ -307,18 +112,17 @@ submit_button = Button("Submit", WIDTH//2 - 100, HEIGHT//2 + 70, 200, 50)
 back_button = Button("Back to Menu", WIDTH//2 - 100, HEIGHT//2 + 50, 200, 50)
 
 async def main():
-    global game_state, mode, ai_difficulty, asteroid_count, asteroid_input, player1, player2, bullets, asteroids, winner, cheat_unlocked, cheat_message, cheat_message_timer, konami_index
+    global game_state, mode, ai_difficulty, asteroid_count, asteroid_input, match, accumulator, winner, cheat_unlocked, cheat_message, cheat_message_timer, konami_index
 
     def setup():
-        global player1, player2, bullets, asteroids, winner
-        player1 = Ship(100, HEIGHT // 2, RED, 0)
-        player2 = Ship(WIDTH - 100, HEIGHT // 2, BLUE, 180)
-        bullets = []
-        asteroids = [Asteroid() for _ in range(asteroid_count)]
+        global match, accumulator, winner
+        match = Match(RULES, asteroid_count, ai2=None if mode == 'pvp' else ai_difficulty)
+        accumulator = 0.0
+        clock.tick()
         winner = None
 
     async def update_loop():
-        global game_state, mode, ai_difficulty, asteroid_count, asteroid_input, player1, player2, bullets, asteroids, winner, cheat_unlocked, cheat_message, cheat_message_timer, konami_index
+        global game_state, mode, ai_difficulty, asteroid_count, asteroid_input, match, accumulator, winner, cheat_unlocked, cheat_message, cheat_message_timer, konami_index
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 return False
@@ -409,84 +213,29 @@ async def main():
             screen.blit(input_text, input_rect)
             submit_button.draw(screen)
         elif game_state == GAME:
-            if player1 is None or player2 is None:
+            if match is None:
                 setup()  # Ensure players are initialized
             keys = pygame.key.get_pressed()
             # Player 1 controls
-            if keys[pygame.K_a]:
-                player1.rotate(1)
-            if keys[pygame.K_d]:
-                player1.rotate(-1)
-            if keys[pygame.K_w]:
-                player1.move()
-            if keys[pygame.K_SPACE]:
-                player1.shoot(bullets)
-
+            controls1 = Controls(keys[pygame.K_a] - keys[pygame.K_d], keys[pygame.K_w], keys[pygame.K_SPACE])
             # Player 2 controls or AI
-            if mode == 'pvp':
-                if keys[pygame.K_LEFT]:
-                    player2.rotate(1)
-                if keys[pygame.K_RIGHT]:
-                    player2.rotate(-1)
-                if keys[pygame.K_UP]:
-                    player2.move()
-                if keys[pygame.K_RETURN]:
-                    player2.shoot(bullets)
-            else:
-                ai_control(player1, player2, bullets, asteroids, ai_difficulty)
-
-            # Update positions
-            if not keys[pygame.K_w]:
-                player1.x += player1.speed_x
-                player1.y += player1.speed_y
-                player1.x = player1.x % WIDTH
-                player1.y = player1.y % HEIGHT
-            if mode == 'pvp' and not keys[pygame.K_UP]:
-                player2.x += player2.speed_x
-                player2.y += player2.speed_y
-                player2.x = player2.x % WIDTH
-                player2.y = player2.y % HEIGHT
-            elif mode == 'ai':
-                player2.x += player2.speed_x
-                player2.y += player2.speed_y
-                player2.x = player2.x % WIDTH
-                player2.y = player2.y % HEIGHT
-
-            player1.shoot_cooldown = max(0, player1.shoot_cooldown - 1)
-            player2.shoot_cooldown = max(0, player2.shoot_cooldown - 1)
-
-            # Update bullets
-            for bullet in bullets[:]:
-                bullet.move()
-                if bullet.life <= 0:
-                    bullets.remove(bullet)
-                elif winner is None:
-                    if player1.alive and math.hypot(bullet.x - player1.x, bullet.y - player1.y) < player1.size + bullet.size and bullet.color != RED:
-                        player1.alive = False
-                        winner = "PLAYER TWO WINS" if mode == 'pvp' else "AI WINS"
-                    elif player2.alive and          math.hypot(bullet.x - player2.x, bullet.y - player2.y) < player2.size + bullet.size and bullet.color != BLUE:
-                        player2.alive = False
-                        winner = "PLAYER ONE WINS"
+            controls2 = Controls(keys[pygame.K_LEFT] - keys[pygame.K_RIGHT], keys[pygame.K_UP], keys[pygame.K_RETURN])
 
-            # Update asteroids
-            for asteroid in asteroids:
-                asteroid.move()
-                if winner is None:
-                    if player1.alive and math.hypot(asteroid.x - player1.x, asteroid.y - player1.y) < (player1.size + asteroid.size):
-                        player1.alive = False
-                        winner = "PLAYER TWO WINS" if mode == 'pvp' else "AI WINS"
-                    if player2.alive and math.hypot(asteroid.x - player2.x, asteroid.y - player2.y) < (player2.size + asteroid.size):
-                        player2.alive = False
-                        winner = "PLAYER ONE WINS"
+            # Run the simulation in fixed ticks, as many as real time calls for
+            accumulator = min(accumulator + clock.tick() / 1000, MAX_STEPS * STEP)
+            while accumulator >= STEP:
+                match.step(controls1, controls2)
+                accumulator -= STEP
+            if match.winner and winner is None:
+                winner = "PLAYER ONE WINS" if match.winner == 1 else "PLAYER TWO WINS" if mode == 'pvp' else "AI WINS"
 
             # Draw
             screen.fill(BLACK)
-            player1.draw(screen)
-            player2.draw(screen)
-            for bullet in bullets:
-                bullet.draw(screen)
-            for asteroid in asteroids:
-                asteroid.draw(screen)
+            draw_ship(screen, match.player1)
+            draw_ship(screen, match.player2)
+            for x, y, size, color in match.bullets.items():
+                draw_bullet(screen, x, y, size, color)
+            draw_asteroids(screen, match.asteroids)
             if winner:
                 text = font.render(winner, True, WHITE)
                 text_rect = text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
@@ -0,0 +1,609 @@
+import argparse
+import math
+import random
+import time
+from collections import namedtuple
+
+import numpy as np
+
+# Display-free Spacewar simulation shared by space.py and spacewar.py. The
+# front ends read the keyboard, call Match.step once per fixed tick and draw
+# the result; everything that decides a game lives here. Randomness comes
+# from the match's own seeded generator, so a duel between two AIs replays
+# exactly and can run as fast as the CPU allows:
+#
+#   python spacewar_core.py --duels 1000 --ai1 hard --ai2 master --seed 0
+
+FPS = 60
+STEP = 1.0 / FPS  # Simulated seconds per tick
+MAX_STEPS = 5  # Ticks a front end may catch up in one frame before dropping time
+MAX_TICKS = 60 * FPS  # Headless duels are called a draw after a minute
+BULLET_SPEED = 5
+BULLET_LIFE = 60  # Ticks, so a regular shot reaches BULLET_SPEED * BULLET_LIFE px
+GRID_CELL = 64  # Asteroid grid cell size in px, at least the widest query radius
+AVOID_RANGE = 50  # AI steers off asteroids closer than this
+SMALL_VOLLEY = 8  # Up to this many bullets are hit-tested in plain Python, below numpy's call overhead
+GRID_MIN = 128  # Smaller asteroid fields are scanned directly, which is quicker than gridding
+
+# Colors, which double as bullet owners
+RED = (255, 0, 0)
+BLUE = (0, 0, 255)
+
+DIFFICULTIES = ['easy', 'hard', 'master', 'ultra_master']
+
+# One ship's inputs for a tick: turn is +1 (left), -1 (right) or 0
+Controls = namedtuple("Controls", "turn thrust shoot")
+IDLE = Controls(0, False, False)
+
+# Ship class
+class Ship:
+    def __init__(self, x, y, color, angle=0):
+        self.x = x
+        self.y = y
+        self.color = color
+        self.angle = angle
+        self.speed_x = 0
+        self.speed_y = 0
+        self.size = 20
+        self.shoot_cooldown = 0
+        self.alive = True
+        self.invincible = False
+        self.invincibility_timer = 0
+        # AI aim, re-solved every reaction ticks: heading, flight time of a shot
+        # along it (None if a shot can't connect) and the tick of the next solve
+        self.aim_angle = angle
+        self.aim_time = None
+        self.next_aim = 0
+        self.specials = {}  # Special attack name -> times used
+
+    def rotate(self, direction):
+        self.angle += direction * 5
+
+    def thrust(self, boost):
+        self.speed_x += math.cos(math.radians(self.angle)) * boost
+        self.speed_y -= math.sin(math.radians(self.angle)) * boost
+
+    def drift(self, width, height):
+        self.x = (self.x + self.speed_x) % width
+        self.y = (self.y + self.speed_y) % height
+
+    def move(self, width, height):
+        self.thrust(0.02)
+        self.drift(width, height)
+
+    def shoot(self, bullets):
+        if self.shoot_cooldown <= 0 and self.alive:
+            bullets.spawn(self.x, self.y, [self.angle], self.color)
+            self.shoot_cooldown = 20
+
+# Colors packed into one int, so owners compare in a single array operation
+def color_code(color):
+    return (color[0] << 16) | (color[1] << 8) | color[2]
+
+# Preallocated pool of bullets as parallel arrays: position, velocity, life,
+# size, color and owner (the firing ship's color, which it can't be hit by).
+# Live bullets fill the first count slots in firing order, so moving, wrapping,
+# expiring and hit-testing a whole storm is a few array operations instead of
+# a Python loop over Bullet objects.
+class BulletPool:
+    def __init__(self, capacity=256):
+        self.count = 0
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.life = np.zeros(capacity, dtype=np.int32)
+        self.size = np.zeros(capacity)
+        self.color = np.zeros(capacity, dtype=np.int32)  # color_code, for drawing
+        self.owner = np.zeros(capacity, dtype=np.int32)  # color_code of the ship that fired it
+
+    def __len__(self):
+        return self.count
+
+    def grow(self, needed):
+        capacity = len(self.x)
+        while capacity < needed:
+            capacity *= 2
+        for field in ("x", "y", "vx", "vy", "life", "size", "color", "owner"):
+            array = getattr(self, field)
+            grown = np.zeros(capacity, dtype=array.dtype)
+            grown[:self.count] = array[:self.count]
+            setattr(self, field, grown)
+
+    # Fire one bullet per angle (degrees) from (x, y)
+    def spawn(self, x, y, angles, color, speed=BULLET_SPEED, life=BULLET_LIFE, size=2, owner=None):
+        start = self.count
+        end = start + len(angles)
+        if end > len(self.x):
+            self.grow(end)
+        radians = np.radians(angles)
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.vx[start:end] = np.cos(radians) * speed
+        self.vy[start:end] = -np.sin(radians) * speed
+        self.life[start:end] = life
+        self.size[start:end] = size
+        self.color[start:end] = color_code(color)
+        self.owner[start:end] = color_code(owner or color)
+        self.count = end
+
+    # Move every bullet with wrap-around and drop the ones that ran out of life
+    def step(self, width, height):
+        n = self.count
+        if not n:
+            return
+        x, y, life = self.x[:n], self.y[:n], self.life[:n]
+        np.mod(x + self.vx[:n], width, out=x)
+        np.mod(y + self.vy[:n], height, out=y)
+        life -= 1
+        live = life > 0
+        if not live.all():
+            keep = np.flatnonzero(live)
+            for array in (self.x, self.y, self.vx, self.vy, self.life, self.size, self.color, self.owner):
+                array[:len(keep)] = array[keep]
+            self.count = len(keep)
+
+    # The first bullet, in firing order, touching one of ships other than the
+    # one that fired it; returns the ship it hits, or None
+    def first_hit(self, ships, width, height):
+        n = self.count
+        if not n:
+            return None
+        if n <= SMALL_VOLLEY:
+            half_width, half_height = width / 2, height / 2
+            for x, y, size, owner in zip(self.x[:n].tolist(), self.y[:n].tolist(), self.size[:n].tolist(), self.owner[:n].tolist()):
+                for ship in ships:
+                    if ship.alive and owner != color_code(ship.color):
+                        dx = (x - ship.x + half_width) % width - half_width
+                        dy = (y - ship.y + half_height) % height - half_height
+                        if dx * dx + dy * dy < (ship.size + size) ** 2:
+                            return ship
+            return None
+        x, y, size, owner = self.x[:n], self.y[:n], self.size[:n], self.owner[:n]
+        first, target = n, None
+        for ship in ships:
+            if not ship.alive:
+                continue
+            reach = ship.size + size
+            dx = wrap_offset(x - ship.x, width)
+            dy = wrap_offset(y - ship.y, height)
+            hits = (dx * dx + dy * dy < reach * reach) & (owner != color_code(ship.color))
+            i = hits.argmax()
+            if hits[i] and i < first:
+                first, target = i, ship
+        return target
+
+    # (x, y, size, color) of every live bullet, for drawing
+    def items(self):
+        n = self.count
+        colors = [(code >> 16, (code >> 8) & 255, code & 255) for code in self.color[:n].tolist()]
+        return zip(self.x[:n].tolist(), self.y[:n].tolist(), self.size[:n].tolist(), colors)
+
+# Uniform grid over a wrapping arena. Cells tile the arena exactly, items are
+# bucketed by a counting sort of their cell numbers, and a query visits the
+# cells its square touches, wrapped across the edges. Rebuilding is a few
+# array operations, so the grid is simply rebuilt whenever its items move.
+class TorusGrid:
+    def __init__(self, width, height, cell=GRID_CELL):
+        self.width = width
+        self.height = height
+        self.cols = max(1, int(width // cell))
+        self.rows = max(1, int(height // cell))
+        self.cell_w = width / self.cols
+        self.cell_h = height / self.rows
+        self.order = np.zeros(0, dtype=np.intp)
+        self.starts = np.zeros(self.cols * self.rows + 1, dtype=np.intp)
+
+    def build(self, x, y):
+        cx = np.minimum((x // self.cell_w).astype(np.intp), self.cols - 1)
+        cy = np.minimum((y // self.cell_h).astype(np.intp), self.rows - 1)
+        cells = cy * self.cols + cx
+        self.order = np.argsort(cells, kind="stable")
+        self.starts[1:] = np.cumsum(np.bincount(cells, minlength=self.cols * self.rows))
+
+    # Indices of every item within radius of (x, y) along both axes, wrapped,
+    # in ascending order; callers still test distances exactly
+    def near(self, x, y, radius):
+        cols = self.wrapped_range(x, radius, self.cell_w, self.cols)
+        rows = self.wrapped_range(y, radius, self.cell_h, self.rows)
+        starts, order = self.starts, self.order
+        chunks = [order[starts[cell]:starts[cell + 1]] for row in rows for cell in (row * self.cols + col for col in cols)]
+        found = np.concatenate(chunks) if chunks else order[:0]
+        found.sort()
+        return found
+
+    @staticmethod
+    def wrapped_range(v, radius, size, count):
+        first = int((v - radius) // size)
+        last = int((v + radius) // size)
+        if last - first + 1 >= count:
+            return range(count)
+        return [c % count for c in range(first, last + 1)]
+
+# Asteroids as parallel arrays, moved together each tick and filed in a
+# TorusGrid for collision and avoidance queries. The grid goes stale when
+# asteroids move or are added and is rebuilt on the next query.
+class AsteroidField:
+    SIZE = 10
+
+    def __init__(self, width, height, capacity=64):
+        self.width = width
+        self.height = height
+        self.count = 0
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.size = np.zeros(capacity)
+        self.grid = TorusGrid(width, height)
+        self.rows = []  # (x, y, size) tuples standing in for the grid on small fields
+        self.stale = True
+
+    def __len__(self):
+        return self.count
+
+    def add(self, x, y, speed_x, speed_y):
+        if self.count == len(self.x):
+            for field in ("x", "y", "vx", "vy", "size"):
+                array = getattr(self, field)
+                setattr(self, field, np.concatenate([array, np.zeros_like(array)]))
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.vx[i] = speed_x
+        self.vy[i] = speed_y
+        self.size[i] = self.SIZE
+        self.count += 1
+        self.stale = True
+
+    def step(self):
+        n = self.count
+        np.mod(self.x[:n] + self.vx[:n], self.width, out=self.x[:n])
+        np.mod(self.y[:n] + self.vy[:n], self.height, out=self.y[:n])
+        self.stale = True
+
+    # Asteroids whose centre is closer than reach (plus their own size if
+    # padded) to (x, y) across the wrap, as (index, dx, dy) in field order
+    def within(self, x, y, reach, padded=False):
+        n = self.count
+        if self.stale:
+            if n < GRID_MIN:
+                self.rows = list(zip(self.x[:n].tolist(), self.y[:n].tolist(), self.size[:n].tolist()))
+            else:
+                self.grid.build(self.x[:n], self.y[:n])
+            self.stale = False
+        if n < GRID_MIN:
+            width, height = self.width, self.height
+            half_width, half_height = width / 2, height / 2
+            close = []
+            for i, (ax, ay, size) in enumerate(self.rows):
+                dx = (ax - x + half_width) % width - half_width
+                dy = (ay - y + half_height) % height - half_height
+                limit = reach + size if padded else reach
+                if dx * dx + dy * dy < limit * limit:
+                    close.append((i, dx, dy))
+            return close
+        found = self.grid.near(x, y, reach + (self.SIZE if padded else 0))
+        dx = wrap_offset(self.x[found] - x, self.width)
+        dy = wrap_offset(self.y[found] - y, self.height)
+        limit = reach + self.size[found] if padded else reach
+        close = dx * dx + dy * dy < limit * limit
+        return list(zip(found[close].tolist(), dx[close].tolist(), dy[close].tolist()))
+
+    # (x, y, size) of every asteroid, for drawing
+    def items(self):
+        n = self.count
+        return zip(self.x[:n].tolist(), self.y[:n].tolist(), self.size[:n].tolist())
+
+# Everything that differs between the two front ends: arena size, the AI
+# difficulty table and what each difficulty's special attacks do.
+#
+# Difficulty rows hold rotation_speed, shoot_chance, move_chance, accuracy
+# (degrees), speed_boost, special_chance, avoidance (chance of steering off a
+# nearby asteroid), avoid_again (the same for the second avoidance pass),
+# specials (names, see special_attack), invincible_frames, reaction (ticks
+# between re-aims) and lead (aim at the intercept point and
+# fire whenever a shot would connect, instead of at the player on a chance).
+class Rules:
+    def __init__(self, width, height, difficulty, big_size, laser_color, laser_size):
+        self.width = width
+        self.height = height
+        self.difficulty = difficulty
+        self.big_size = big_size
+        self.laser_color = laser_color
+        self.laser_size = laser_size
+
+    # Copy of these rules with one more difficulty row, base's row with some
+    # values changed; used to try out tuning without touching the real table
+    def with_difficulty(self, name, base, **changes):
+        difficulty = dict(self.difficulty)
+        difficulty[name] = dict(self.difficulty[base], **changes)
+        return Rules(self.width, self.height, difficulty, self.big_size, self.laser_color, self.laser_size)
+
+SPACE_RULES = Rules(800, 600, {
+    'easy': dict(rotation_speed=2, shoot_chance=0.01, move_chance=0.05, accuracy=40, speed_boost=0.01,
+                 special_chance=0.0, avoidance=0.5, avoid_again=0.5, specials=[], invincible_frames=0,
+                 reaction=12, lead=False),
+    'hard': dict(rotation_speed=5, shoot_chance=0.05, move_chance=0.3, accuracy=20, speed_boost=0.02,
+                 special_chance=0.01, avoidance=0.8, avoid_again=1.0, specials=['rapid', 'big'], invincible_frames=0,
+                 reaction=2, lead=False),
+    'master': dict(rotation_speed=8, shoot_chance=0.15, move_chance=0.6, accuracy=8, speed_boost=0.02,
+                   special_chance=0.05, avoidance=0.95, avoid_again=1.0, specials=['ultrarapid', 'asteroid'], invincible_frames=0,
+                   reaction=3, lead=True),
+    'ultra_master': dict(rotation_speed=12, shoot_chance=0.3, move_chance=0.9, accuracy=3, speed_boost=0.02,
+                         special_chance=0.05, avoidance=1.0, avoid_again=1.0, specials=['two_asteroids', 'sparks', 'laser'], invincible_frames=0,
+                         reaction=1, lead=True),
+}, big_size=5, laser_color=RED, laser_size=4)
+
+SPACEWAR_RULES = Rules(1600, 900, {
+    'easy': dict(rotation_speed=2, shoot_chance=0.01, move_chance=0.06, accuracy=40, speed_boost=0.02,
+                 special_chance=0.0, avoidance=0.5, avoid_again=0.5, specials=[], invincible_frames=0,
+                 reaction=12, lead=False),
+    'hard': dict(rotation_speed=5, shoot_chance=0.06, move_chance=0.3, accuracy=20, speed_boost=0.02,
+                 special_chance=0.01, avoidance=0.8, avoid_again=1.0, specials=['rapid', 'big'], invincible_frames=0,
+                 reaction=2, lead=False),
+    'master': dict(rotation_speed=8, shoot_chance=0.15, move_chance=0.6, accuracy=8, speed_boost=0.02,
+                   special_chance=0.05, avoidance=0.95, avoid_again=1.0, specials=['ultrarapid', 'invincible'], invincible_frames=45,
+                   reaction=3, lead=True),
+    'ultra_master': dict(rotation_speed=12, shoot_chance=0.3, move_chance=0.6, accuracy=3, speed_boost=0.02,
+                         special_chance=0.05, avoidance=1.0, avoid_again=1.0, specials=['sparks', 'laser', 'invincible'], invincible_frames=90,
+                         reaction=1, lead=True),
+}, big_size=10, laser_color=BLUE, laser_size=20)
+
+# Helper function to get a signed angle difference in (-180, 180]
+def angle_between(target, angle):
+    diff = (target - angle) % 360
+    return diff - 360 if diff > 180 else diff
+
+def angle_to(dx, dy):
+    return math.degrees(math.atan2(-dy, dx)) % 360
+
+# Shortest signed offset along a wrapping axis, so distances see across the
+# arena's edges; works on floats and arrays
+def wrap_offset(d, span):
+    return (d + span / 2) % span - span / 2
+
+# Closed-form intercept: the heading (degrees) and flight time (ticks) of a
+# bullet fired at speed from (x, y) that meets a target at (target_x, target_y)
+# moving at a constant (speed_x, speed_y), aiming at the nearest wrapped image
+# of the target. Solves |d + v t| = speed t for the earliest t > 0; returns
+# (angle to the target, None) if the bullet can never catch it.
+def intercept(x, y, target_x, target_y, speed_x, speed_y, speed, width, height):
+    dx = wrap_offset(target_x - x, width)
+    dy = wrap_offset(target_y - y, height)
+    a = speed_x * speed_x + speed_y * speed_y - speed * speed
+    b = 2 * (dx * speed_x + dy * speed_y)
+    c = dx * dx + dy * dy
+    if abs(a) < 1e-9:
+        t = -c / b if b < 0 else None
+    else:
+        discriminant = b * b - 4 * a * c
+        if discriminant < 0:
+            return angle_to(dx, dy), None
+        root = math.sqrt(discriminant)
+        times = [t for t in ((-b - root) / (2 * a), (-b + root) / (2 * a)) if t > 0]
+        t = min(times) if times else None
+    if t is None:
+        return angle_to(dx, dy), None
+    return angle_to(dx + speed_x * t, dy + speed_y * t), t
+
+# One match: two ships, bullets and asteroids on a wrapping arena. A ship is
+# flown either by Controls passed to step or, if its difficulty is set, by
+# ai_control aiming at the other ship.
+class Match:
+    def __init__(self, rules, asteroid_count=3, seed=None, ai1=None, ai2=None):
+        self.rules = rules
+        self.rng = random.Random(seed)
+        self.width = rules.width
+        self.height = rules.height
+        self.player1 = Ship(100, self.height // 2, RED, 0)
+        self.player2 = Ship(self.width - 100, self.height // 2, BLUE, 180)
+        self.ai = [ai1, ai2]
+        self.bullets = BulletPool()
+        self.asteroids = AsteroidField(self.width, self.height, max(64, asteroid_count))
+        for _ in range(asteroid_count):
+            self.add_random_asteroid()
+        self.winner = None  # 1 or 2 once the other ship is destroyed
+        self.ticks = 0
+
+    def add_random_asteroid(self):
+        rng = self.rng
+        self.asteroids.add(rng.randint(0, self.width) % self.width, rng.randint(0, self.height) % self.height,
+                           rng.uniform(-0.5, 0.5), rng.uniform(-0.5, 0.5))
+
+    # Advance one tick. controls1 and controls2 are ignored for AI ships.
+    def step(self, controls1=IDLE, controls2=IDLE):
+        width, height = self.width, self.height
+        ships = [(self.player1, self.player2, controls1, self.ai[0]), (self.player2, self.player1, controls2, self.ai[1])]
+        for ship, target, controls, difficulty in ships:
+            if difficulty:
+                ai_control(self, target, ship, difficulty)
+            else:
+                if controls.turn:
+                    ship.rotate(controls.turn)
+                if controls.thrust:
+                    ship.move(width, height)
+                if controls.shoot:
+                    ship.shoot(self.bullets)
+        # Ships flown by hand coast when they didn't thrust; AI ships only move in ai_control
+        for ship, target, controls, difficulty in ships:
+            if not difficulty and not controls.thrust:
+                ship.drift(width, height)
+        self.player1.shoot_cooldown = max(0, self.player1.shoot_cooldown - 1)
+        self.player2.shoot_cooldown = max(0, self.player2.shoot_cooldown - 1)
+
+        # Update bullets
+        self.bullets.step(width, height)
+        if self.winner is None:
+            ship = self.bullets.first_hit([self.player1, self.player2], width, height)
+            if ship:
+                self.destroy(ship)
+
+        # Update asteroids. Like the bullets, the first asteroid in field order
+        # to touch a ship decides the game, and one asteroid can take out both.
+        self.asteroids.step()
+        if self.winner is None:
+            first = {}
+            for ship in (self.player1, self.player2):
+                if ship.alive:
+                    hits = self.asteroids.within(ship.x, ship.y, ship.size, padded=True)
+                    if hits:
+                        first[ship] = hits[0][0]
+            if first:
+                earliest = min(first.values())
+                for ship in (self.player1, self.player2):
+                    if first.get(ship) == earliest:
+                        self.destroy(ship)
+        self.ticks += 1
+        return self.winner
+
+    def destroy(self, ship):
+        ship.alive = False
+        self.winner = 2 if ship is self.player1 else 1
+
+    # Play until someone wins or max_ticks pass; returns the winner or None
+    def run(self, max_ticks=MAX_TICKS):
+        while self.winner is None and self.ticks < max_ticks:
+            self.step()
+        return self.winner
+
+# Special attacks, each fired from the opponent's position and heading
+def special_attack(match, name, player, opponent, params):
+    rng = match.rng
+    bullets = match.bullets
+    if name == 'rapid':
+        # Rapid-fire: 3 bullets with slight angle variance
+        bullets.spawn(opponent.x, opponent.y, [opponent.angle + rng.uniform(-5, 5) for _ in range(3)], opponent.color)
+    elif name == 'big':
+        # Big bullet: Slower, larger size
+        bullets.spawn(opponent.x, opponent.y, [opponent.angle], opponent.color, speed=3, size=match.rules.big_size)
+    elif name == 'ultrarapid':
+        # Ultra-rapid-fire: 10 bullets with wider variance
+        bullets.spawn(opponent.x, opponent.y, [opponent.angle + rng.uniform(-10, 10) for _ in range(10)], opponent.color)
+    elif name in ('asteroid', 'two_asteroids'):
+        # Shoot asteroids towards the player, two of them with slight variance
+        dx = wrap_offset(player.x - opponent.x, match.width)
+        dy = wrap_offset(player.y - opponent.y, match.height)
+        dist = math.hypot(dx, dy)
+        if dist > 0:
+            dir_x = dx / dist
+            dir_y = dy / dist
+            # Launched from just outside the hull, so it doesn't hit its own ship
+            clear = opponent.size + AsteroidField.SIZE + 1
+            x = (opponent.x + dir_x * clear) % match.width
+            y = (opponent.y + dir_y * clear) % match.height
+            if name == 'asteroid':
+                match.asteroids.add(x, y, dir_x * 2, dir_y * 2)
+            else:
+                for _ in range(2):
+                    match.asteroids.add(x, y, (dir_x + rng.uniform(-0.2, 0.2)) * 2, (dir_y + rng.uniform(-0.2, 0.2)) * 2)
+    elif name == 'sparks':
+        # Fire blue sparks all over the arena (20 small random bullets)
+        bullets.spawn(opponent.x, opponent.y, [rng.uniform(0, 360) for _ in range(20)], BLUE, speed=3, life=30, size=1,
+                      owner=opponent.color)
+    elif name == 'laser':
+        # Crackling laser bolt: Fast and big
+        bullets.spawn(opponent.x, opponent.y, [opponent.angle], match.rules.laser_color,
+                      speed=10, life=40, size=match.rules.laser_size, owner=opponent.color)
+    elif name == 'invincible':
+        # Temporary invincibility with yellow glow
+        opponent.invincible = True
+        opponent.invincibility_timer = params['invincible_frames']
+
+# AI logic: fly opponent against player
+def ai_control(match, player, opponent, difficulty):
+    if not opponent.alive:
+        return
+    rng = match.rng
+    params = match.rules.difficulty[difficulty]
+    accuracy = params['accuracy']
+    width, height = match.width, match.height
+
+    # Update invincibility timer
+    if opponent.invincibility_timer > 0:
+        opponent.invincibility_timer -= 1
+        if opponent.invincibility_timer <= 0:
+            opponent.invincible = False
+
+    # Re-aim once per reaction window: at the intercept point for leading
+    # difficulties, otherwise at where the player is now
+    if match.ticks >= opponent.next_aim:
+        opponent.next_aim = match.ticks + params['reaction']
+        if params['lead']:
+            opponent.aim_angle, opponent.aim_time = intercept(opponent.x, opponent.y, player.x, player.y, player.speed_x,
+                                                              player.speed_y, BULLET_SPEED, width, height)
+        else:
+            opponent.aim_angle = angle_to(wrap_offset(player.x - opponent.x, width), wrap_offset(player.y - opponent.y, height))
+            opponent.aim_time = None
+    # A leading AI fires whenever a shot would land in range
+    lethal = params['lead'] and opponent.aim_time is not None and opponent.aim_time <= BULLET_LIFE
+
+    # Rotate towards player
+    angle_diff = angle_between(opponent.aim_angle, opponent.angle)
+    if abs(angle_diff) > accuracy:
+        opponent.rotate(1 if angle_diff > 0 else -1)
+
+    # Move with standardized thrust
+    if rng.random() < params['move_chance']:
+        opponent.thrust(params['speed_boost'])
+        opponent.drift(width, height)
+
+    # Regular shoot when aligned
+    if (lethal or rng.random() < params['shoot_chance']) and abs(angle_diff) < accuracy:
+        opponent.shoot(match.bullets)
+
+    # Special attacks
+    if rng.random() < params['special_chance'] and params['specials']:
+        name = rng.choice(params['specials'])
+        opponent.specials[name] = opponent.specials.get(name, 0) + 1
+        special_attack(match, name, player, opponent, params)
+
+    # Avoid asteroids
+    for _, dx, dy in match.asteroids.within(opponent.x, opponent.y, AVOID_RANGE):
+        angle_diff = angle_between(angle_to(dx, dy), opponent.angle)
+        if rng.random() < params['avoidance']:
+            opponent.rotate(-1 if angle_diff > 0 else 1)
+
+    # Move more frequently
+    if rng.random() < params['move_chance']:
+        opponent.move(width, height)
+
+    # Shoot when aligned
+    if (lethal or rng.random() < params['shoot_chance']) and abs(angle_diff) < accuracy:
+        opponent.shoot(match.bullets)
+
+    # Avoid asteroids again
+    for _, dx, dy in match.asteroids.within(opponent.x, opponent.y, AVOID_RANGE):
+        angle_diff = angle_between(angle_to(dx, dy), opponent.angle)
+        if params['avoid_again'] >= 1 or rng.random() < params['avoid_again']:
+            opponent.rotate(-1 if angle_diff > 0 else 1)
+
+# Play count seeded AI-vs-AI duels; returns (wins1, wins2, draws, ticks)
+def run_duels(count, rules, ai1, ai2, asteroid_count=3, seed=0, max_ticks=MAX_TICKS):
+    seeds = random.Random(seed)
+    wins = {1: 0, 2: 0, None: 0}
+    ticks = 0
+    for _ in range(count):
+        match = Match(rules, asteroid_count, seeds.getrandbits(32), ai1, ai2)
+        wins[match.run(max_ticks)] += 1
+        ticks += match.ticks
+    return wins[1], wins[2], wins[None], ticks
+
+def main():
+    parser = argparse.ArgumentParser(description="Run headless Spacewar AI duels.")
+    parser.add_argument("--duels", type=int, default=1000)
+    parser.add_argument("--ai1", choices=DIFFICULTIES, default="hard")
+    parser.add_argument("--ai2", choices=DIFFICULTIES, default="master")
+    parser.add_argument("--asteroids", type=int, default=3)
+    parser.add_argument("--rules", choices=["space", "spacewar"], default="space")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rules = SPACE_RULES if args.rules == "space" else SPACEWAR_RULES
+    start = time.perf_counter()
+    wins1, wins2, draws, ticks = run_duels(args.duels, rules, args.ai1, args.ai2, args.asteroids, args.seed)
+    elapsed = time.perf_counter() - start
+    print(f"{args.ai1} (red) {wins1}  {args.ai2} (blue) {wins2}  draws {draws}")
+    print(f"{args.duels / elapsed * 60:.0f} duels/minute, {ticks / elapsed / FPS:.0f}x real time")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+import argparse
+import itertools
+import json
+import math
+import multiprocessing
+import time
+
+from spacewar_core import DIFFICULTIES, FPS, MAX_TICKS, SPACE_RULES, SPACEWAR_RULES, Match
+
+# Headless Spacewar tournament: AI difficulties fly seeded duels against each
+# other across a process pool, and the results are rolled up into Elo
+# ratings, time-to-kill and special attack usage.
+#
+# Sweeps tune one difficulty: every combination of the swept values becomes a
+# variant of it, and each variant flies against the unchanged difficulties so
+# all of them land on the same rating scale.
+#
+#   python spacewar_tournament.py --matches 200 --processes 8
+#   python spacewar_tournament.py --tune master --sweep accuracy=4,8,12 --sweep shoot_chance=0.1,0.2
+
+RULES = {"space": SPACE_RULES, "spacewar": SPACEWAR_RULES}
+ELO_MEAN = 1500
+ELO_ITERATIONS = 200
+
+# Rules with every variant among the entrants added as its own difficulty row
+def rules_for(rules_name, entrants):
+    rules = RULES[rules_name]
+    for name, base, changes in entrants:
+        if changes:
+            rules = rules.with_difficulty(name, base, **dict(changes))
+    return rules
+
+# Play one duel and return its result; runs inside a worker process
+def play_match(task):
+    rules_name, entrant_a, entrant_b, seed, asteroids, max_ticks = task
+    rules = rules_for(rules_name, [entrant_a, entrant_b])
+    # Swap seats on odd seeds so neither side always flies the red ship
+    swapped = seed % 2 == 1
+    ai1, ai2 = (entrant_b[0], entrant_a[0]) if swapped else (entrant_a[0], entrant_b[0])
+    match = Match(rules, asteroids, seed, ai1, ai2)
+    winner = match.run(max_ticks)
+    ship_a, ship_b = (match.player2, match.player1) if swapped else (match.player1, match.player2)
+    if winner is None:
+        result = None
+    else:
+        result = "A" if (winner == 1) != swapped else "B"
+    return {
+        "pairing": (entrant_a[0], entrant_b[0]),
+        "seed": seed,
+        "ticks": match.ticks,
+        "winner": result,
+        "specials": [ship_a.specials, ship_b.specials],
+    }
+
+# Elo ratings from a Bradley-Terry maximum likelihood fit, so they don't
+# depend on match order. Draws count half a win each way, and every pair that
+# met gets one extra virtual draw so unbeaten or winless entrants still get
+# finite ratings.
+def elo_ratings(results, names):
+    score = {name: 0.0 for name in names}
+    games = {}
+    for result in results:
+        a, b = result["pairing"]
+        games[a, b] = games.get((a, b), 0) + 1
+        score[a] += {"A": 1.0, "B": 0.0, None: 0.5}[result["winner"]]
+        score[b] += {"A": 0.0, "B": 1.0, None: 0.5}[result["winner"]]
+    opponents = {name: [] for name in names}
+    for (a, b), n in games.items():
+        score[a] += 0.5
+        score[b] += 0.5
+        opponents[a].append((b, n + 1))
+        opponents[b].append((a, n + 1))
+    strength = {name: 1.0 for name in names}
+    for _ in range(ELO_ITERATIONS):
+        updated = {}
+        for name in names:
+            total = sum(n / (strength[name] + strength[other]) for other, n in opponents[name])
+            updated[name] = score[name] / total if total else 1.0
+        centre = math.exp(sum(math.log(s) for s in updated.values()) / len(updated))
+        strength = {name: s / centre for name, s in updated.items()}
+    return {name: ELO_MEAN + 400 * math.log10(s) for name, s in strength.items()}
+
+# Roll match results up per pairing and per entrant
+def build_report(results, names):
+    ratings = elo_ratings(results, names)
+    report = {"pairings": [], "entrants": {}}
+    pairings = {}
+    for result in results:
+        pairings.setdefault(result["pairing"], []).append(result)
+    totals = {name: {"matches": 0, "wins": 0, "draws": 0, "kill_ticks": [], "ticks": 0, "specials": {}} for name in names}
+    for (name_a, name_b), matches in sorted(pairings.items(), key=lambda item: (names.index(item[0][0]), names.index(item[0][1]))):
+        n = len(matches)
+        wins_a = sum(1 for m in matches if m["winner"] == "A")
+        wins_b = sum(1 for m in matches if m["winner"] == "B")
+        kills = [m["ticks"] for m in matches if m["winner"]]
+        report["pairings"].append({
+            "a": name_a,
+            "b": name_b,
+            "matches": n,
+            "a_wins": wins_a,
+            "b_wins": wins_b,
+            "draws": n - wins_a - wins_b,
+            "a_win_rate": wins_a / n,
+            "avg_time_to_kill": sum(kills) / len(kills) / FPS if kills else None,
+        })
+        for m in matches:
+            for side, name in enumerate((name_a, name_b)):
+                total = totals[name]
+                total["matches"] += 1
+                total["ticks"] += m["ticks"]
+                if m["winner"] is None:
+                    total["draws"] += 1
+                elif m["winner"] == "AB"[side]:
+                    total["wins"] += 1
+                    total["kill_ticks"].append(m["ticks"])
+                for special, count in m["specials"][side].items():
+                    total["specials"][special] = total["specials"].get(special, 0) + count
+    for name in sorted(names, key=lambda name: -ratings[name]):
+        total = totals[name]
+        minutes = total["ticks"] / FPS / 60
+        kills = total["kill_ticks"]
+        report["entrants"][name] = {
+            "elo": ratings[name],
+            "matches": total["matches"],
+            "wins": total["wins"],
+            "draws": total["draws"],
+            "win_rate": total["wins"] / total["matches"] if total["matches"] else 0.0,
+            "avg_time_to_kill": sum(kills) / len(kills) / FPS if kills else None,
+            "specials_per_minute": sum(total["specials"].values()) / minutes if minutes else 0.0,
+            "specials": total["specials"],
+        }
+    return report
+
+def seconds(value):
+    return f"{value:.1f}s" if value is not None else "-"
+
+def print_report(report, elapsed):
+    matches = sum(p["matches"] for p in report["pairings"])
+    print(f"{matches} matches in {elapsed:.1f}s ({matches / max(elapsed, 1e-9) * 60:.0f} matches/minute)\n")
+    width = max([len(name) for name in report["entrants"]] + [12]) + 2
+    print(f"{'A':<{width}}{'B':<{width}}{'matches':>8}{'A win %':>9}{'draws':>7}{'time to kill':>14}")
+    for p in report["pairings"]:
+        print(f"{p['a']:<{width}}{p['b']:<{width}}{p['matches']:>8}{100 * p['a_win_rate']:>8.1f}%{p['draws']:>7}"
+              f"{seconds(p['avg_time_to_kill']):>14}")
+    print(f"\n{'Entrant':<{width}}{'Elo':>6}{'matches':>8}{'win %':>8}{'time to kill':>14}{'specials/min':>14}  specials used")
+    for name, e in report["entrants"].items():
+        used = ", ".join(f"{special} {count}" for special, count in sorted(e["specials"].items())) or "-"
+        print(f"{name:<{width}}{e['elo']:>6.0f}{e['matches']:>8}{100 * e['win_rate']:>7.1f}%{seconds(e['avg_time_to_kill']):>14}"
+              f"{e['specials_per_minute']:>14.2f}  {used}")
+
+# "accuracy=4,8,12" -> ("accuracy", [4, 8, 12]); values are JSON where they parse
+def parse_sweep(text):
+    key, _, values = text.partition("=")
+    if not key or not values:
+        raise argparse.ArgumentTypeError(f"expected name=value,value,... not {text!r}")
+    parsed = []
+    for value in values.split(","):
+        try:
+            parsed.append(json.loads(value))
+        except ValueError:
+            parsed.append(value)
+    return key, parsed
+
+# One variant of base per combination of the swept values
+def sweep_entrants(rules, base, sweeps):
+    unknown = [key for key, _ in sweeps if key not in rules.difficulty[base]]
+    if unknown:
+        raise SystemExit(f"unknown difficulty setting(s): {', '.join(unknown)}")
+    keys = [key for key, _ in sweeps]
+    variants = []
+    for values in itertools.product(*(values for _, values in sweeps)):
+        changes = tuple(zip(keys, values))
+        name = f"{base}[{','.join(f'{key}={value}' for key, value in changes)}]"
+        variants.append((name, base, changes))
+    return variants
+
+def main():
+    parser = argparse.ArgumentParser(description="Run seeded AI-vs-AI Spacewar tournaments across all cores.")
+    parser.add_argument("--matches", type=int, default=100, help="matches per pairing")
+    parser.add_argument("--seed", type=int, default=0, help="base seed; match i of a pairing uses seed + i")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--difficulties", nargs="+", default=DIFFICULTIES, choices=DIFFICULTIES, help="difficulties to include")
+    parser.add_argument("--rules", choices=sorted(RULES), default="space", help="space.py or spacewar.py tuning")
+    parser.add_argument("--asteroids", type=int, default=3)
+    parser.add_argument("--max-seconds", type=float, default=MAX_TICKS / FPS, help="simulated seconds before a match is a draw")
+    parser.add_argument("--tune", choices=DIFFICULTIES, help="difficulty to sweep")
+    parser.add_argument("--sweep", type=parse_sweep, action="append", default=[], metavar="SETTING=V1,V2,...",
+                        help="values to try for one of --tune's settings; repeat to sweep several")
+    parser.add_argument("--json", help="also write the full report to this file")
+    args = parser.parse_args()
+    if args.sweep and not args.tune:
+        parser.error("--sweep needs --tune")
+
+    baseline = [(name, name, ()) for name in args.difficulties]
+    variants = sweep_entrants(RULES[args.rules], args.tune, args.sweep) if args.sweep else []
+    pairs = list(itertools.combinations(baseline, 2)) + [(variant, base) for variant in variants for base in baseline]
+    max_ticks = int(args.max_seconds * FPS)
+    tasks = [(args.rules, a, b, args.seed + i, args.asteroids, max_ticks) for a, b in pairs for i in range(args.matches)]
+    start = time.perf_counter()
+    with multiprocessing.Pool(args.processes) as pool:
+        results = list(pool.imap_unordered(play_match, tasks, chunksize=16))
+    elapsed = time.perf_counter() - start
+
+    report = build_report(results, [name for name, _, _ in baseline + variants])
+    print_report(report, elapsed)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
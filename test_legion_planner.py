@@ -0,0 +1,42 @@
+import numpy as np
+from legion_engine import UNIT_TYPES, resolve_battle
+from legion_planner import candidate_ks, rollout
+
+BATTLES = 4000
+
+# Garrisons covering every type matchup, single-type sides and near-even fights
+GARRISONS = [
+    ((3, 2, 1), (1, 1, 1)),
+    ((5, 0, 0), (0, 4, 0)),
+    ((0, 0, 6), (2, 0, 3)),
+    ((2, 2, 2), (3, 3, 0)),
+    ((4, 4, 4), (5, 1, 2)),
+    ((1, 1, 0), (1, 0, 0)),
+]
+
+
+# The planner's closed-form rollout keeps its own copy of the battle rule;
+# check its statistics against resolve_battle itself
+def simulate(config, unit_rng):
+    attacker, defender, k, use_war_cry = config
+    captures = own = enemy = 0
+    for _ in range(BATTLES):
+        first, second, captured = resolve_battle(dict(zip(UNIT_TYPES, attacker)), dict(zip(UNIT_TYPES, defender)),
+                                                 k, use_war_cry, unit_rng)
+        captures += captured
+        own += sum(first.values()) + (sum(second.values()) if captured else 0)
+        enemy += 0 if captured else sum(second.values())
+    return captures / BATTLES, own / BATTLES, enemy / BATTLES
+
+
+def test_rollout_matches_resolve_battle():
+    unit_rng = np.random.default_rng(0)
+    for attacker, defender in GARRISONS:
+        for k in candidate_ks(sum(attacker), sum(defender)):
+            for use_war_cry in (False, True):
+                config = (attacker, defender, k, use_war_cry)
+                expected = simulate(config, unit_rng)
+                actual = rollout(config, 20000, unit_rng)
+                assert abs(actual[0] - expected[0]) < 0.03, (config, actual, expected)
+                assert abs(actual[1] - expected[1]) < 0.15, (config, actual, expected)
+                assert abs(actual[2] - expected[2]) < 0.15, (config, actual, expected)
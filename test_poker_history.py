@@ -0,0 +1,34 @@
+from poker_engine import AIDifficulty, AIPlayer, PokerEngine
+from poker_history import HandHistoryWriter, read_hands
+
+
+def write_history(path, hands):
+    players = [AIPlayer("A", AIDifficulty.EASY), AIPlayer("B", AIDifficulty.MEDIUM)]
+    engine = PokerEngine(players, seed=3)
+    engine.history = HandHistoryWriter(path)
+    for _ in range(hands):
+        engine.play_hand()
+    engine.history.close()
+
+
+def test_read_hands_round_trip(tmp_path):
+    path = tmp_path / "history.bin"
+    write_history(path, 5)
+    hands = read_hands(path)
+    assert len(hands) == 5
+    assert all(chips is not None for _, _, _, chips in hands)
+
+
+def test_read_hands_stops_at_truncated_record(tmp_path):
+    path = tmp_path / "history.bin"
+    write_history(path, 5)
+    complete = read_hands(path)
+    data = path.read_bytes()
+    # Cut at every length: the result is always a prefix of complete hands
+    for size in range(len(data)):
+        path.write_bytes(data[:size])
+        hands = read_hands(path)
+        assert hands == complete[:len(hands)]
+        assert all(chips is not None for _, _, _, chips in hands)
+    path.write_bytes(data[:-1])
+    assert read_hands(path) == complete[:-1]